@@ -1,17 +1,42 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, stream_with_context, make_response, g
 from flask_cors import CORS
-from database.models import db, HealthPlatform, TrendData, User, DistrictBoundary, YouthRepresentative, youth_rep_districts
-from geoalchemy2.functions import ST_GeomFromText, ST_AsGeoJSON
+from database.models import db, HealthPlatform, TrendData, User, DistrictBoundary, YouthRepresentative, DataVersion, RevokedToken, UploadJob, youth_rep_districts
+from geojson_stream import (
+    GeoJSONFeatureStream, GeoJSONFormatError, ShapefileFeatureStream, geojson_features, geojson_member
+)
+from geo_formats import (
+    encode_topojson, DEFAULT_QUANTIZATION, OrjsonProvider, raw_json, dumps_bytes,
+    result_columns, encode_arrow, encode_flatgeobuf, pa, ARROW_MIMETYPE, FLATGEOBUF_MIMETYPE
+)
+from geoalchemy2.functions import ST_AsGeoJSON
 from werkzeug.utils import secure_filename
 import os
 from dotenv import load_dotenv
-import geopandas as gpd
+import numpy as np
+import shapely
 import json
 import tempfile
 import shutil
 from datetime import datetime, timedelta
 import jwt
+import gzip
+import hashlib
+import math
+import click
+import threading
+import uuid
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
+from pmtiles.tile import zxy_to_tileid, TileType, Compression
+from pmtiles.writer import Writer as PMTilesWriter
+from pmtiles.reader import Reader as PMTilesReader
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; responses fall back to gzip
+    brotli = None
 
 # Helper function to get current year
 def get_current_year():
@@ -27,6 +52,9 @@ load_dotenv()
 
 app = Flask(__name__)
 
+# orjson-backed jsonify; embeds raw_json() geometry text without re-parsing
+app.json = OrjsonProvider(app)
+
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'postgresql://localhost/srhr_dashboard')
@@ -36,7 +64,10 @@ if app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgres://'):
     app.config['SQLALCHEMY_DATABASE_URI'] = app.config['SQLALCHEMY_DATABASE_URI'].replace('postgres://', 'postgresql://', 1)
 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_UPLOAD_SIZE', 16 * 1024 * 1024))  # 16MB default
+# Uploads are saved to disk and imported feature by feature (GeoJSON) or in blocks of
+# rows (shapefiles, see geojson_stream), so the limit is bounded by disk space rather
+# than worker memory
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_UPLOAD_SIZE', 512 * 1024 * 1024))  # 512MB default
 
 # Upload configuration
 UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
@@ -50,18 +81,594 @@ db.init_app(app)
 # CORS configuration
 CORS(app, resources={
     r"/api/*": {
-        "origins": os.getenv('CORS_ORIGINS', 'http://localhost:5173').split(',')
+        "origins": os.getenv('CORS_ORIGINS', 'http://localhost:5173').split(','),
+        "expose_headers": ['X-Next-After-Id', 'Content-Disposition']
     }
 })
 
+# Upload responses list at most this many point names outside every district boundary
+MAX_REPORTED_OUTSIDE_POINTS = 50
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# Seconds before a table or column reported missing is looked up again (it may
+# have been created by initialize_tables or a migration on another worker)
+SCHEMA_MISSING_TABLE_RECHECK = int(os.getenv('SCHEMA_MISSING_TABLE_RECHECK', 60))
+
+class SchemaRegistry:
+    """Table (and, on demand, column) names loaded once per worker, so schema
+    checks are set lookups.
+    
+    Loaded on first use; refresh() after creating or altering tables
+    (initialize_tables, init-db). Missing tables and columns are re-checked at
+    most every SCHEMA_MISSING_TABLE_RECHECK seconds.
+    """
+    
+    def __init__(self):
+        self.tables = None
+        self.columns = {}  # table -> (column names, loaded at)
+        self.loaded_at = 0
+        self.lock = threading.Lock()
+    
+    def refresh(self):
+        from sqlalchemy import inspect
+        tables = frozenset(inspect(db.engine).get_table_names())
+        with self.lock:
+            self.tables = tables
+            self.columns = {}
+            self.loaded_at = time.monotonic()
+        return tables
+    
+    def has_column(self, table, column):
+        if not self.has_table(table):
+            return False
+        entry = self.columns.get(table)
+        if entry is None or (column not in entry[0] and
+                             time.monotonic() - entry[1] > SCHEMA_MISSING_TABLE_RECHECK):
+            from sqlalchemy import inspect
+            entry = (frozenset(col['name'] for col in inspect(db.engine).get_columns(table)), time.monotonic())
+            with self.lock:
+                self.columns[table] = entry
+        return column in entry[0]
+    
+    def has_table(self, name):
+        tables = self.tables
+        if tables is None:
+            tables = self.refresh()
+        elif name not in tables and time.monotonic() - self.loaded_at > SCHEMA_MISSING_TABLE_RECHECK:
+            tables = self.refresh()
+        return name in tables
+
+schema_registry = SchemaRegistry()
+
+# Streaming configuration (rows fetched per server-side cursor round trip)
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 2000))
+
+def wants_stream():
+    """True when the client asked for a streamed response (?stream=1)"""
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+def stream_json_array(query, params, render_row, head='[', tail=']'):
+    """Stream query rows as a JSON array using a server-side cursor.
+    
+    The query runs before the response starts (so SQL errors still surface
+    as normal errors); rows are then fetched STREAM_BATCH_SIZE at a time and
+    each batch is rendered with render_row(row) -> JSON text and yielded, so
+    worker memory stays flat no matter how many rows the year has.
+    """
+    result = db.session.execute(query, params, execution_options={
+        'stream_results': True,
+        'yield_per': STREAM_BATCH_SIZE
+    })
+    
+    def generate():
+        yield head
+        separator = ''
+        try:
+            for batch in result.partitions():
+                if batch:
+                    yield separator + ','.join(render_row(row) for row in batch)
+                    separator = ','
+        finally:
+            result.close()
+        yield tail
+    
+    return app.response_class(stream_with_context(generate()), mimetype='application/json')
+
+# Binary export formats (?format=arrow|fgb): encoder, mimetype, file extension
+BINARY_FORMATS = {
+    'arrow': (encode_arrow, ARROW_MIMETYPE, 'arrow'),
+    'fgb': (encode_flatgeobuf, FLATGEOBUF_MIMETYPE, 'fgb')
+}
+
+def binary_format():
+    """Requested binary export format, or None for JSON"""
+    fmt = request.args.get('format', '').lower()
+    return fmt if fmt in BINARY_FORMATS else None
+
+def binary_response(query, params, fmt, filename, limit=None):
+    """Encode query rows (WKB point column named geometry) as Arrow IPC or FlatGeobuf.
+    
+    Rows are transposed straight into columns, so a full pull is one compact
+    buffer with no per-row dicts or JSON.
+    """
+    if fmt == 'arrow' and pa is None:
+        return jsonify({"error": "format=arrow requires pyarrow on the server"}), 501
+    
+    encoder, mimetype, extension = BINARY_FORMATS[fmt]
+    names, columns = result_columns(db.session.execute(query, params))
+    response = app.response_class(encoder(names, columns), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}.{extension}'
+    ids = columns[names.index('id')]
+    if limit and len(ids) == limit:
+        response.headers['X-Next-After-Id'] = str(ids[-1])
+    return response
+
+# Listing pagination (keyset on id: ?after_id=<last id seen>&limit=<page size>)
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 10000))
+
+def multi_value_arg(name):
+    """Values of a repeatable and/or comma-separated query parameter (?category=a,b&category=c)"""
+    values = []
+    for raw in request.args.getlist(name):
+        values.extend(value.strip() for value in raw.split(',') if value.strip())
+    return values
+
+def listing_filters(alias, filter_columns):
+    """SQL conditions and params for bbox, multi-value and keyset filters on a point table.
+    
+    filter_columns maps query parameter -> column. ?bbox=minx,miny,maxx,maxy is
+    answered with && on the GIST location index. Raises ValueError on a bad bbox.
+    """
+    conditions = []
+    params = {}
+    
+    for arg, column in filter_columns.items():
+        values = multi_value_arg(arg)
+        if values:
+            conditions.append(f"{alias}.{column} = ANY(:{arg}_values)")
+            params[f'{arg}_values'] = values
+    
+    bbox = request.args.get('bbox')
+    if bbox:
+        try:
+            minx, miny, maxx, maxy = [float(value) for value in bbox.split(',')]
+        except ValueError:
+            raise ValueError("bbox must be minx,miny,maxx,maxy")
+        conditions.append(f"{alias}.location && ST_MakeEnvelope(:bbox_minx, :bbox_miny, :bbox_maxx, :bbox_maxy, 4326)")
+        params.update({'bbox_minx': minx, 'bbox_miny': miny, 'bbox_maxx': maxx, 'bbox_maxy': maxy})
+    
+    after_id = request.args.get('after_id', type=int)
+    if after_id is not None:
+        conditions.append(f"{alias}.id > :after_id")
+        params['after_id'] = after_id
+    
+    return conditions, params
+
+def page_limit():
+    """Requested page size (?limit=), capped at MAX_PAGE_SIZE; None means no paging"""
+    limit = request.args.get('limit', type=int)
+    if limit is None or limit <= 0:
+        return None
+    return min(limit, MAX_PAGE_SIZE)
+
+# Server-side marker clustering (?cluster=<zoom> on the point listings)
+CLUSTER_EXPAND_ZOOM = int(os.getenv('CLUSTER_EXPAND_ZOOM', 16))  # Street zoom: individual points from here on
+CLUSTER_CELL_PIXELS = 60  # Grid cell size on screen
+WEB_MERCATOR_WORLD_M = 40075016.68557849
+
+def cluster_zoom():
+    """Zoom requested with ?cluster=, or None when points should be listed individually"""
+    zoom = request.args.get('cluster', type=int)
+    if zoom is None or zoom >= CLUSTER_EXPAND_ZOOM:
+        return None
+    return max(zoom, 0)
+
+def cluster_response(table, alias, category_column, conditions, params, zoom, properties_sql):
+    """GeoJSON clusters of a point table snapped to a zoom-dependent Web Mercator grid.
+    
+    Each cluster is a point at the mean position of its members with point_count
+    and a per-category breakdown, so the payload is bounded by the number of
+    grid cells on screen rather than by the number of rows. A cell holding a
+    single point is returned as that point's own feature (its id and
+    `properties_sql`, a json expression on `alias`).
+    """
+    grid = WEB_MERCATOR_WORLD_M / (256 * 2 ** zoom) * CLUSTER_CELL_PIXELS
+    query = db.text(f"""
+        WITH points AS (
+            SELECT id, ST_X(geom) AS x, ST_Y(geom) AS y, category
+            FROM (
+                SELECT {alias}.id, ST_Transform({alias}.location, 3857) AS geom, {alias}.{category_column} AS category
+                FROM {table} {alias}
+                WHERE {' AND '.join(conditions) if conditions else 'TRUE'}
+            ) projected
+        ),
+        cells AS (
+            SELECT FLOOR(x / :grid) AS gx, FLOOR(y / :grid) AS gy, COALESCE(category, 'Other') AS category,
+                   COUNT(*) AS n, SUM(x) AS sx, SUM(y) AS sy, MIN(id) AS first_id
+            FROM points
+            GROUP BY 1, 2, 3
+        ),
+        clusters AS (
+            SELECT gx, gy,
+                   ST_Transform(ST_SetSRID(ST_MakePoint(SUM(sx) / SUM(n), SUM(sy) / SUM(n)), 3857), 4326) AS center,
+                   SUM(n) AS point_count,
+                   json_object_agg(category, n)::text AS categories,
+                   MIN(first_id) AS first_id
+            FROM cells
+            GROUP BY gx, gy
+        )
+        SELECT c.gx, c.gy, ST_X(c.center) AS longitude, ST_Y(c.center) AS latitude, c.point_count, c.categories,
+               {alias}.id, ST_AsGeoJSON({alias}.location) AS geometry, {properties_sql}::text AS properties
+        FROM clusters c
+        LEFT JOIN {table} {alias} ON c.point_count = 1 AND {alias}.id = c.first_id
+        ORDER BY c.point_count DESC
+    """)
+    
+    return jsonify({
+        'type': 'FeatureCollection',
+        'zoom': zoom,
+        'grid_size_m': round(grid, 1),
+        'features': [cluster_feature(row) for row in db.session.execute(query, dict(params, grid=grid))]
+    })
+
+def cluster_feature(row):
+    """GeoJSON feature for one row of the cluster_response query"""
+    if row.id is not None:
+        # The stored location, not the cell mean (which went through a 3857 round trip)
+        return {'type': 'Feature', 'id': row.id, 'geometry': raw_json(row.geometry),
+                'properties': raw_json(row.properties)}
+    return {
+        'type': 'Feature',
+        'id': f'{int(row.gx)}:{int(row.gy)}',
+        'geometry': {'type': 'Point', 'coordinates': [row.longitude, row.latitude]},
+        'properties': {
+            'cluster': True,
+            'point_count': int(row.point_count),
+            'categories': raw_json(row.categories)
+        }
+    }
+
+# Data versions and conditional GET
+HTTP_CACHE_CONTROL = os.getenv('HTTP_CACHE_CONTROL', 'public, no-cache')
+
+# Compressed response cache (per worker, bounded by total cached bytes). Entries are
+# keyed by data versions, which only API writes bump: writes made outside the API
+# (psql, seed scripts) must bump data_versions too (see database/add_data_versions.sql),
+# otherwise cached bodies are served until they expire after RESPONSE_CACHE_TTL.
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 600))
+COMPRESSION_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 7
+
+class CompressedResponseCache:
+    """LRU of response bodies keyed by (data ETag, content encoding), expiring after ttl seconds"""
+    
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+    
+    def get(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+            expires, entry = item
+            if expires <= time.monotonic():
+                del self.entries[key]
+                self.size -= len(entry[0])
+                return None
+            self.entries.move_to_end(key)
+            return entry
+    
+    def put(self, key, entry):
+        """Store a (body, mimetype, extra headers) entry, evicting least recently used ones"""
+        body = entry[0]
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[1][0])
+            self.entries[key] = (time.monotonic() + self.ttl, entry)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= len(evicted[0])
+
+response_cache = CompressedResponseCache(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL)
+
+def negotiate_encoding():
+    """Best content encoding the client accepts: br, gzip or identity"""
+    offered = ['br', 'gzip'] if brotli else ['gzip']
+    return request.accept_encodings.best_match(offered) or 'identity'
+
+def compress_body(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+def compressed_cache(f):
+    """Decorator (inside @conditional_get): serve cached, pre-compressed bodies.
+    
+    Entries are keyed by the data ETag (path + query + table versions), so a
+    repeat request skips both the endpoint's SQL and the compression, and any
+    API write to the underlying tables makes old entries unreachable.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        etag = g.get('data_etag')
+        if not etag:
+            return f(*args, **kwargs)
+        
+        encoding = negotiate_encoding()
+        cached = response_cache.get((etag, encoding))
+        if cached is None:
+            identity = response_cache.get((etag, 'identity'))
+            if identity is None:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed or 'Cache-Control' in response.headers:
+                    return response
+                # Keep endpoint headers such as X-Next-After-Id with the body
+                headers = [(name, value) for name, value in response.headers
+                           if name not in ('Content-Type', 'Content-Length')]
+                identity = (response.get_data(), response.mimetype, headers)
+                response_cache.put((etag, 'identity'), identity)
+            
+            body, mimetype, headers = identity
+            if len(body) < COMPRESSION_MIN_BYTES:
+                encoding = 'identity'
+            if encoding == 'identity':
+                cached = identity
+            else:
+                cached = (compress_body(body, encoding), mimetype, headers)
+                response_cache.put((etag, encoding), cached)
+        
+        body, mimetype, headers = cached
+        response = app.response_class(body, mimetype=mimetype, headers=headers)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+    return decorated_function
+
+# Dashboard aggregate cache (per worker). Entries are keyed by the source table's
+# data version, so a write on any worker makes older entries unreachable; local
+# writes also evict them via data_changed(), and the TTL bounds memory use.
+AGGREGATE_CACHE_TTL = int(os.getenv('AGGREGATE_CACHE_TTL', 300))
+
+class TTLCache:
+    """TTL memo of small query results, keyed by (name, *args), with hit/miss counters"""
+    
+    def __init__(self, ttl, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+    
+    def get_or_compute(self, key, compute):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self.generation
+        
+        value = compute()
+        with self.lock:
+            # Skip storing if an eviction ran meanwhile: the value may predate the write
+            if generation == self.generation:
+                self.entries[key] = (now + self.ttl, value)
+                if len(self.entries) > self.max_entries:
+                    self._prune(now)
+        return value
+    
+    def _prune(self, now):
+        """Drop expired entries, then the oldest ones while still over max_entries"""
+        for key in [key for key, entry in self.entries.items() if entry[0] <= now]:
+            del self.entries[key]
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+    
+    def evict(self, name, *args):
+        """Drop entries for `name`; with args, only entries whose arguments start with them"""
+        with self.lock:
+            self.generation += 1
+            stale = [key for key in self.entries if key[0] == name and key[1:len(args) + 1] == args]
+            for key in stale:
+                del self.entries[key]
+            self.evictions += len(stale)
+    
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "ttl_seconds": self.ttl
+            }
+
+aggregate_cache = TTLCache(AGGREGATE_CACHE_TTL)
+
+def table_version(table):
+    """Data version of a table, from the snapshot conditional_get took for this request if any"""
+    versions = g.get('data_versions') or {}
+    if table in versions:
+        return versions[table]
+    return DataVersion.get_versions([table])[table]
+
+def versioned_aggregate(table, key, compute):
+    """aggregate_cache lookup with the table's data version appended to the key"""
+    try:
+        version = table_version(table)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Warning: Could not read data version for {table}: {e}")
+        return compute()
+    return aggregate_cache.get_or_compute(key + (version,), compute)
+
+def cached_platform_years():
+    return versioned_aggregate('health_platforms', ('platform_years',), HealthPlatform.get_available_years)
+
+def cached_facility_years():
+    def compute():
+        if not schema_registry.has_table('facilities'):
+            return []
+        result = db.session.execute(db.text("SELECT DISTINCT year FROM facilities ORDER BY year"))
+        return [row[0] for row in result]
+    return versioned_aggregate('facilities', ('facility_years',), compute)
+
+def cached_statistics(year):
+    return versioned_aggregate('health_platforms', ('statistics', year),
+                               lambda: HealthPlatform.get_statistics_by_year(year))
+
+def cached_trends():
+    return versioned_aggregate('trend_data', ('trends',), TrendData.get_all_trends)
+
+# Cached aggregates derived from each table; names listed under 'by_year' are keyed by year
+TABLE_CACHED_AGGREGATES = {
+    'health_platforms': {'all': ['platform_years'], 'by_year': ['statistics']},
+    'facilities': {'all': ['facility_years'], 'by_year': []},
+    'trend_data': {'all': ['trends'], 'by_year': []}
+}
+
+def evict_aggregates(table, year=None):
+    """Drop cached aggregates for a table (only the given year's where they are per year)"""
+    aggregates = TABLE_CACHED_AGGREGATES.get(table)
+    if not aggregates:
+        return
+    for name in aggregates['all']:
+        aggregate_cache.evict(name)
+    for name in aggregates['by_year']:
+        if year is None:
+            aggregate_cache.evict(name)
+        else:
+            aggregate_cache.evict(name, year)
+
+# Tables whose writes also invalidate a vector tile layer
+TABLE_TILE_LAYERS = {
+    'district_boundaries': 'boundaries',
+    'health_platforms': 'health_platforms',
+    'facilities': 'facilities'
+}
+
+def data_changed(table, year=None):
+    """Record a committed write: bump the table's data version (which also moves
+    its tile layer to a new cache folder), evict cached aggregates and prune old tiles.
+    
+    Call after db.session.commit() so a new version never describes old data.
+    District rollups are not refreshed here: writes update them before
+    committing (update_district_rollups) so they commit with the points.
+    """
+    evict_aggregates(table, year)
+    evict_district_summaries(table, year)
+    evict_density(table, year)
+    try:
+        DataVersion.bump(table)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Warning: Could not bump data version for {table}: {e}")
+    if table in TABLE_TILE_LAYERS:
+        prune_tile_cache(TABLE_TILE_LAYERS[table])
+
+def data_etag(tables):
+    """Strong ETag for the current request from its path, query and table versions"""
+    versions = DataVersion.get_versions(tables)
+    # Cached aggregates read the same snapshot, so the body always matches the ETag
+    g.data_versions = versions
+    key = json.dumps([request.path, sorted(request.args.items(multi=True)), versions], sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def no_store(response):
+    """Mark a fallback response (e.g. an empty list after an error) as not cacheable"""
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+def conditional_get(*tables):
+    """Decorator: ETag responses by data version and answer If-None-Match with 304.
+    
+    A matching If-None-Match returns before the view runs, so unchanged data
+    costs one small data_versions lookup instead of the endpoint's queries.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                etag = data_etag(tables)
+            except Exception as e:
+                db.session.rollback()
+                print(f"Warning: Could not read data versions: {e}")
+                return f(*args, **kwargs)
+            g.data_etag = etag
+            
+            # Compressed bodies carry a weak ETag, so match weak and strong forms
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+                weak = not request.if_none_match.contains(etag)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200 or 'Cache-Control' in response.headers:
+                    return response
+                weak = 'Content-Encoding' in response.headers
+            
+            response.set_etag(etag, weak=weak)
+            response.headers['Cache-Control'] = HTTP_CACHE_CONTROL
+            return response
+        return decorated_function
+    return decorator
+
 # JWT Configuration
 JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', app.config['SECRET_KEY'])
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 24
 
+# Per-worker auth state cache: user role/is_active and the revoked token ids.
+# manage_user and logout evict locally; other workers pick changes up within the TTL.
+AUTH_CACHE_TTL = int(os.getenv('AUTH_CACHE_TTL', 60))
+auth_cache = TTLCache(AUTH_CACHE_TTL)
+
+class AuthUser(namedtuple('AuthUser', ['id', 'username', 'role', 'is_active'])):
+    """Cached authorization state of a user (no ORM instance, safe to share across requests)"""
+    __slots__ = ()
+    
+    def has_role(self, required_role):
+        return User.role_satisfies(self.role, required_role)
+
+def load_auth_user(user_id):
+    user = User.query.get(user_id)
+    if not user:
+        return None
+    return AuthUser(user.id, user.username, user.role, user.is_active)
+
+def cached_auth_user(user_id):
+    return auth_cache.get_or_compute(('user', user_id), lambda: load_auth_user(user_id))
+
+def revoked_token_ids():
+    """Revoked jti set; failures are not cached so a DB blip cannot disable revocation for a TTL"""
+    # Until add_revoked_tokens.sql has run there is nothing to check (and no query to fail)
+    if not schema_registry.has_table('revoked_tokens'):
+        return frozenset()
+    try:
+        return auth_cache.get_or_compute(('revoked_tokens',), RevokedToken.active_ids)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Warning: Could not load revoked tokens: {e}")
+        return frozenset()
+
 def generate_token(user):
     """Generate JWT token for user"""
     payload = {
@@ -69,7 +676,8 @@ def generate_token(user):
         'username': user.username,
         'role': user.role,
         'exp': datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
-        'iat': datetime.utcnow()
+        'iat': datetime.utcnow(),
+        'jti': uuid.uuid4().hex
     }
     return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
@@ -83,20 +691,31 @@ def verify_token(token):
     except jwt.InvalidTokenError:
         return None
 
-def get_current_user():
-    """Get current user from request token"""
+def request_token_payload():
+    """Verified JWT payload of the request's Bearer token, or None"""
     auth_header = request.headers.get('Authorization')
     if not auth_header:
         return None
     
     try:
         token = auth_header.split(' ')[1]  # Bearer <token>
-        payload = verify_token(token)
-        if payload:
-            user = User.query.get(payload['user_id'])
+    except IndexError:
+        return None
+    return verify_token(token)
+
+def get_current_user():
+    """Get current user's auth state (AuthUser) from request token.
+    
+    Signature, expiry, revocation and role state are all checked in memory
+    while the worker's auth cache is warm; the database is only hit on a miss.
+    """
+    try:
+        payload = request_token_payload()
+        if payload and payload.get('jti') not in revoked_token_ids():
+            user = cached_auth_user(payload['user_id'])
             if user and user.is_active:
                 return user
-    except (IndexError, KeyError):
+    except KeyError:
         pass
     return None
 
@@ -130,7 +749,11 @@ def health_check():
     return jsonify({
         "status": "ok",
         "message": "SRHR Dashboard API is running",
-        "database": db_status
+        "database": db_status,
+        "aggregate_cache": aggregate_cache.stats(),
+        "auth_cache": auth_cache.stats(),
+        "district_summary_cache": district_summary_cache.stats(),
+        "density_cache": density_cache.stats()
     })
 
 
@@ -228,14 +851,27 @@ def register():
 @require_auth()
 def get_current_user_info():
     """Get current authenticated user info"""
-    user = get_current_user()
+    user = User.query.get(get_current_user().id)
+    if not user:
+        # Deleted since its token was issued (the auth cache may still hold it briefly)
+        return jsonify({'error': 'User not found'}), 404
     return jsonify({'user': user.to_dict()}), 200
 
 
 @app.route('/api/auth/logout', methods=['POST'])
 @require_auth()
 def logout():
-    """Logout endpoint (client should discard token)"""
+    """Logout endpoint: revokes the token (client should still discard it)"""
+    payload = request_token_payload()
+    try:
+        if payload.get('jti'):
+            RevokedToken.revoke(payload['jti'], payload['user_id'], datetime.utcfromtimestamp(payload['exp']))
+            auth_cache.evict('revoked_tokens')
+    except Exception as e:
+        db.session.rollback()
+        print(f"Logout error: {e}")
+        return jsonify({'error': 'Logout failed. Please try again.'}), 500
+    auth_cache.evict('user', payload['user_id'])
     return jsonify({'message': 'Logged out successfully'}), 200
 
 
@@ -306,6 +942,7 @@ def manage_user(user_id):
                 user.set_password(data['password'])
             
             db.session.commit()
+            auth_cache.evict('user', user_id)
             
             return jsonify({
                 'user': user.to_dict(),
@@ -320,6 +957,7 @@ def manage_user(user_id):
             
             db.session.delete(user)
             db.session.commit()
+            auth_cache.evict('user', user_id)
             
             return jsonify({'message': 'User deleted successfully'}), 200
         
@@ -334,13 +972,11 @@ def init_admin():
     """Initialize default admin user (only works if no users exist)"""
     try:
         # Ensure users table exists
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        
-        if 'users' not in inspector.get_table_names():
+        if not schema_registry.has_table('users'):
             # Create all tables including users
             with app.app_context():
                 db.create_all()
+            schema_registry.refresh()
         
         # Check if any users exist
         try:
@@ -402,23 +1038,20 @@ def init_admin():
 
 
 @app.route('/api/years', methods=['GET'])
+@conditional_get('health_platforms', 'facilities')
 def get_available_years():
     """Get all available years from database (health_platforms and facilities)"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        
         # Get years from health_platforms
-        health_years = HealthPlatform.get_available_years()
+        health_years = cached_platform_years()
         
         # Get years from facilities table if it exists
         facilities_years = []
-        if 'facilities' in inspector.get_table_names():
-            try:
-                result = db.session.execute(db.text("SELECT DISTINCT year FROM facilities ORDER BY year"))
-                facilities_years = [row[0] for row in result]
-            except Exception as e:
-                print(f"Error fetching facilities years: {e}")
+        try:
+            facilities_years = cached_facility_years()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error fetching facilities years: {e}")
         
         # Combine and deduplicate years
         all_years = list(set(health_years + facilities_years))
@@ -443,52 +1076,137 @@ def get_available_years():
         }), 500
 
 
+# GeoJSON Feature for a health_platforms row (aliased as hp), rendered database-side
+HEALTH_PLATFORM_PROPERTIES_SQL = """
+    json_build_object(
+        'id', hp.id,
+        'name', hp.name,
+        'type', hp.type,
+        'youth_count', hp.youth_count,
+        'total_members', hp.total_members,
+        'year', hp.year,
+        'address', hp.address,
+        'description', hp.description,
+        'district', hp.district
+    )
+"""
+HEALTH_PLATFORM_FEATURE_SQL = f"""
+    json_build_object(
+        'type', 'Feature',
+        'geometry', ST_AsGeoJSON(hp.location)::json,
+        'properties', {HEALTH_PLATFORM_PROPERTIES_SQL}
+    )
+"""
+
+
 @app.route('/api/geospatial-data', methods=['GET'])
+@conditional_get('health_platforms')
+@compressed_cache
 def get_geospatial_data():
-    """Get geospatial data for a specific year"""
+    """Get geospatial data for a specific year
+    
+    Optional filters: ?bbox=minx,miny,maxx,maxy, ?type= and ?district= (repeatable
+    or comma-separated), and keyset paging with ?after_id=&limit= (the next
+    cursor is returned in the X-Next-After-Id header when more rows may follow).
+    ?format=arrow|fgb returns Arrow IPC or FlatGeobuf instead of GeoJSON.
+    ?cluster=<zoom> returns grid clusters with per-type counts below street zoom.
+    """
     year = request.args.get('year', type=int)
     
     if not year:
         # Get most recent year
-        years = HealthPlatform.get_available_years()
+        years = cached_platform_years()
         year = max(years) if years else get_current_year()
     
     try:
-        platforms = HealthPlatform.query.filter_by(year=year).all()
+        conditions, params = listing_filters('hp', {'type': 'type', 'district': 'district'})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    conditions.insert(0, "hp.year = :year")
+    params['year'] = year
+    
+    limit = page_limit()
+    if limit:
+        params['limit'] = limit
+    platforms_sql = f"""
+        (SELECT * FROM health_platforms hp
+         WHERE {' AND '.join(conditions)}
+         ORDER BY hp.id
+         {'LIMIT :limit' if limit else ''}) hp
+    """
+    
+    try:
+        zoom = cluster_zoom()
+        if zoom is not None:
+            return cluster_response('health_platforms', 'hp', 'type', conditions, params, zoom,
+                                    HEALTH_PLATFORM_PROPERTIES_SQL)
+        
+        fmt = binary_format()
+        if fmt:
+            query = db.text(f"""
+                SELECT hp.id, hp.name, hp.type, hp.youth_count, hp.total_members, hp.year,
+                       hp.address, hp.description, hp.district,
+                       ST_AsBinary(hp.location) AS geometry
+                FROM {platforms_sql}
+                ORDER BY hp.id
+            """)
+            return binary_response(query, params, fmt, f'health_platforms_{year}', limit)
         
-        features = [platform.to_geojson_feature() for platform in platforms]
+        if wants_stream():
+            query = db.text(f"""
+                SELECT {HEALTH_PLATFORM_FEATURE_SQL}::text AS feature
+                FROM {platforms_sql}
+                ORDER BY hp.id
+            """)
+            return stream_json_array(query, params, lambda row: row.feature,
+                                     head='{"type": "FeatureCollection", "features": [',
+                                     tail=']}')
+        
+        # Build the whole FeatureCollection in PostGIS (one statement, no
+        # per-platform ST_AsGeoJSON round trips) and pass the text through as-is
+        query = db.text(f"""
+            SELECT json_build_object(
+                'type', 'FeatureCollection',
+                'features', COALESCE(json_agg({HEALTH_PLATFORM_FEATURE_SQL} ORDER BY hp.id), '[]'::json)
+            )::text AS geojson,
+            COUNT(*) AS feature_count,
+            MAX(hp.id) AS last_id
+            FROM {platforms_sql}
+        """)
         
-        geojson = {
-            "type": "FeatureCollection",
-            "features": features
-        }
+        row = db.session.execute(query, params).fetchone()
         
-        return jsonify(geojson)
+        response = app.response_class(row.geojson, mimetype='application/json')
+        if limit and row.feature_count == limit:
+            response.headers['X-Next-After-Id'] = str(row.last_id)
+        return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/trends', methods=['GET'])
+@conditional_get('trend_data')
 def get_trends():
     """Get trend data for all years"""
     try:
-        trends = TrendData.get_all_trends()
+        trends = cached_trends()
         return jsonify(trends)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/statistics', methods=['GET'])
+@conditional_get('health_platforms')
 def get_statistics():
     """Get summary statistics for a specific year"""
     year = request.args.get('year', type=int)
     
     if not year:
-        years = HealthPlatform.get_available_years()
+        years = cached_platform_years()
         year = max(years) if years else get_current_year()
     
     try:
-        stats = HealthPlatform.get_statistics_by_year(year)
+        stats = cached_statistics(year)
         
         if not stats:
             return jsonify({
@@ -505,10 +1223,172 @@ def get_statistics():
         return jsonify({"error": str(e)}), 500
 
 
+# Background upload jobs (local thread pool per worker; state lives in upload_jobs)
+UPLOAD_JOB_WORKERS = int(os.getenv('UPLOAD_JOB_WORKERS', 2))
+UPLOAD_JOB_PROGRESS_INTERVAL = 2  # Seconds between progress writes
+# Queued/running jobs without an update for this long are treated as lost with their worker
+UPLOAD_JOB_STALE_SECONDS = int(os.getenv('UPLOAD_JOB_STALE_SECONDS', 1800))
+upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_JOB_WORKERS, thread_name_prefix='upload-job')
+
+# Cache warming after writes: one shared thread per worker, at most one pending run per key
+warm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cache-warm')
+_pending_warm_keys = set()
+_pending_warm_lock = threading.Lock()
+
+def submit_warm(key, task):
+    """Queue task() on warm_executor unless a run for `key` is already waiting.
+    
+    The key is released when the run starts, so a write landing during a run
+    still queues one more pass over the new data.
+    """
+    with _pending_warm_lock:
+        if key in _pending_warm_keys:
+            return
+        _pending_warm_keys.add(key)
+    
+    def run():
+        with _pending_warm_lock:
+            _pending_warm_keys.discard(key)
+        task()
+    
+    warm_executor.submit(run)
+
+class UploadFormatError(ValueError):
+    """The uploaded file cannot be imported (reported as 400)"""
+
+UPLOAD_FORMAT_ERRORS = (GeoJSONFormatError, UploadFormatError)
+
+def discard_upload(filepath):
+    """Delete a saved upload and its shapefile extraction folder, if any"""
+    shutil.rmtree(f'{filepath}_extract', ignore_errors=True)
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+
+def wants_sync_upload():
+    """Import within the request: asked for with sync=true, or upload_jobs is not migrated yet"""
+    sync = request.form.get('sync') or request.args.get('sync', '')
+    return sync.lower() in ('1', 'true', 'yes') or not schema_registry.has_table('upload_jobs')
+
+class UploadJobProgress:
+    """progress(rows=, phase=) callback passed to the importers.
+    
+    Rows are written to upload_jobs at most every UPLOAD_JOB_PROGRESS_INTERVAL
+    seconds; phase changes are written immediately.
+    """
+    
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.rows = 0
+        self.written_at = 0.0
+    
+    def __call__(self, rows=None, phase=None):
+        if rows is not None:
+            self.rows = rows
+        now = time.monotonic()
+        if phase is None and now - self.written_at < UPLOAD_JOB_PROGRESS_INTERVAL:
+            return
+        fields = {'rows_processed': self.rows}
+        if phase:
+            fields['phase'] = phase
+        try:
+            UploadJob.update(self.job_id, **fields)
+        except Exception as e:
+            print(f"Warning: Could not record progress for job {self.job_id}: {e}")
+        self.written_at = now
+
+def run_upload_job(job_id, process, *args):
+    """Worker-thread body: run process(*args, progress=...) and record the outcome"""
+    with app.app_context():
+        progress = UploadJobProgress(job_id)
+        try:
+            if not UploadJob.start(job_id):
+                print(f"Upload job {job_id} is no longer queued; skipping")
+                return
+            result = process(*args, progress=progress)
+            UploadJob.update(job_id, status='done', phase='done', rows_processed=result['features'],
+                             result=dumps_bytes(result).decode(), finished_at=datetime.utcnow())
+            print(f"Upload job {job_id} finished: {result['features']} features")
+        except Exception as e:
+            db.session.rollback()
+            import traceback
+            print(f"Upload job {job_id} failed: {traceback.format_exc()}")
+            try:
+                UploadJob.update(job_id, status='failed', phase='failed', rows_processed=progress.rows,
+                                 error=str(e), finished_at=datetime.utcnow())
+            except Exception as update_error:
+                print(f"Warning: Could not record failure for job {job_id}: {update_error}")
+        finally:
+            db.session.remove()
+
+def fail_stale_upload_jobs(job_id=None):
+    """Fail queued/running jobs (or just job_id) not updated within UPLOAD_JOB_STALE_SECONDS"""
+    cutoff = datetime.utcnow() - timedelta(seconds=UPLOAD_JOB_STALE_SECONDS)
+    return UploadJob.fail_stale(cutoff, job_id)
+
+def submit_upload_job(job_id, kind, filename, filepath, process, *args):
+    """Record a queued job and hand it to the worker pool (process(filepath, *args))"""
+    try:
+        UploadJob.create(job_id, kind, filename, get_current_user().id)
+        upload_executor.submit(run_upload_job, job_id, process, filepath, *args)
+    except Exception:
+        discard_upload(filepath)
+        raise
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+@require_auth('editor')  # Require editor role or higher
+def get_upload_job(job_id):
+    """Status of a background upload job: phase, rows processed, rows/second and errors
+    
+    Only the user who started the job, or an admin, can read it.
+    """
+    try:
+        if not schema_registry.has_table('upload_jobs'):
+            return jsonify({"error": "Job not found"}), 404
+        
+        fail_stale_upload_jobs(job_id)
+        job = UploadJob.query.get(job_id)
+        # Editors see their own jobs only; someone else's job is reported as missing
+        current_user = get_current_user()
+        if not job or (job.created_by != current_user.id and not current_user.has_role('admin')):
+            return jsonify({"error": "Job not found"}), 404
+        
+        return no_store(jsonify(job.to_dict()))
+    except Exception as e:
+        print(f"Error fetching job {job_id}: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+def fail_interrupted_upload_jobs():
+    """Fail stale jobs left queued/running by a previous process (they can never finish).
+    
+    Run once per deployment, not per worker: from gunicorn's on_starting hook
+    (gunicorn.conf.py), `flask --app app_db fail-stale-upload-jobs` or the dev server.
+    """
+    with app.app_context():
+        try:
+            if schema_registry.has_table('upload_jobs'):
+                interrupted = fail_stale_upload_jobs()
+                if interrupted:
+                    print(f"Marked {interrupted} interrupted upload job(s) as failed")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Note: Could not check for interrupted upload jobs: {e}")
+        finally:
+            db.session.remove()
+
+
 @app.route('/api/upload', methods=['POST'])
 @require_auth('editor')  # Require editor role or higher
 def upload_file():
-    """Upload geospatial data file"""
+    """Upload geospatial data file
+    
+    The saved file is imported by a background job: the response (202) carries
+    a job_id to poll at /api/jobs/<job_id>. Send sync=true to import within the
+    request and get the import result directly.
+    """
     if 'file' not in request.files:
         return jsonify({"error": "No file provided"}), 400
     
@@ -518,6 +1398,7 @@ def upload_file():
     district = request.form.get('district', None)
     
     if not year:
+        # Uncached: a stale list from another worker's write would pick the wrong year
         years = HealthPlatform.get_available_years()
         year = max(years) + 1 if years else get_current_year()
     
@@ -529,69 +1410,195 @@ def upload_file():
     
     try:
         filename = secure_filename(file.filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
+        job_id = uuid.uuid4().hex
+        # Unique per upload so queued jobs never overwrite each other's files
+        filepath = os.path.join(UPLOAD_FOLDER, f'{job_id}_{filename}')
         file.save(filepath)
         
+        if not wants_sync_upload():
+            submit_upload_job(job_id, 'points', filename, filepath, process_point_upload,
+                              filename, year, category, district)
+            return jsonify({
+                "message": "Upload queued",
+                "job_id": job_id,
+                "status_url": f"/api/jobs/{job_id}",
+                "filename": filename,
+                "year": year
+            }), 202
+        
+        return jsonify(process_point_upload(filepath, filename, year, category, district))
+        
+    except UPLOAD_FORMAT_ERRORS as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        import traceback
+        error_trace = traceback.format_exc()
+        print(f"Upload error: {e}")
+        print(f"Traceback: {error_trace}")
+        return jsonify({
+            "error": f"Error processing file: {str(e)}",
+            "details": error_trace
+        }), 500
+
+
+def process_point_upload(filepath, filename, year, category, district, progress=None):
+    """Import a saved point upload and refresh everything derived from it.
+    
+    Returns the upload result body; raises UPLOAD_FORMAT_ERRORS for bad files.
+    """
+    try:
         # Process the file
         if filename.endswith('.geojson') or filename.endswith('.json'):
-            with open(filepath, 'r') as f:
-                geojson_data = json.load(f)
-            
-            if 'type' not in geojson_data or geojson_data['type'] != 'FeatureCollection':
-                return jsonify({"error": "Invalid GeoJSON format. Must be a FeatureCollection"}), 400
-            
-            # Import data into database
-            feature_count = import_geojson_to_db(geojson_data, year, category, district)
-            
+            # Import data into database, reading the file feature by feature
+            feature_count, outside_points = import_geojson_to_db(GeoJSONFeatureStream(filepath), year, category, district,
+                                                                 progress=progress)
+        
         elif filename.endswith('.shp') or filename.endswith('.zip'):
             if filename.endswith('.zip'):
-                extract_folder = os.path.join(UPLOAD_FOLDER, 'temp_extract')
+                extract_folder = f'{filepath}_extract'
                 os.makedirs(extract_folder, exist_ok=True)
                 shutil.unpack_archive(filepath, extract_folder)
                 
                 shp_files = [f for f in os.listdir(extract_folder) if f.endswith('.shp')]
                 if not shp_files:
-                    return jsonify({"error": "No shapefile found in zip"}), 400
+                    raise UploadFormatError("No shapefile found in zip")
                 
                 shp_path = os.path.join(extract_folder, shp_files[0])
             else:
                 shp_path = filepath
             
-            gdf = gpd.read_file(shp_path)
-            geojson_data = json.loads(gdf.to_json())
-            
-            feature_count = import_geojson_to_db(geojson_data, year, category, district)
-            
-            if filename.endswith('.zip'):
-                shutil.rmtree(extract_folder)
-        
-        # Update trend data
-        TrendData.update_trends()
-        
-        return jsonify({
-            "message": "File uploaded successfully",
-            "filename": filename,
-            "features": feature_count,
-            "year": year
-        })
-        
-    except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Upload error: {e}")
-        print(f"Traceback: {error_trace}")
-        return jsonify({
-            "error": f"Error processing file: {str(e)}",
-            "details": error_trace
-        }), 500
+            # Read in blocks of rows rather than converting the whole shapefile at once
+            feature_count, outside_points = import_geojson_to_db(ShapefileFeatureStream(shp_path), year, category,
+                                                                 district, progress=progress)
+    finally:
+        # Imported rows live in the database; the saved file is not needed again
+        discard_upload(filepath)
+    
+    if progress:
+        progress(phase='post-processing')
+    
+    # Update trend data
+    TrendData.update_trends()
+    
+    # Features may carry their own year, so treat the whole table as changed
+    data_changed('health_platforms' if category == 'health' else 'facilities')
+    data_changed('trend_data')
+    warm_district_summaries(year)
+    warm_density(year)
+    
+    return {
+        "message": "File uploaded successfully",
+        "filename": filename,
+        "features": feature_count,
+        "year": year,
+        "outside_boundaries": len(outside_points),
+        "outside_boundary_names": outside_points[:MAX_REPORTED_OUTSIDE_POINTS]
+    }
+
+
+# Bulk point loader: rows per INSERT ... SELECT statement
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 5000))
+
+# Columns written by the bulk loader, with their json_to_recordset types
+POINT_IMPORT_COLUMNS = {
+    'health_platforms': [
+        ('name', 'text'), ('type', 'text'), ('youth_count', 'integer'), ('total_members', 'integer'),
+        ('year', 'integer'), ('address', 'text'), ('description', 'text'), ('district', 'text')
+    ],
+    'facilities': [
+        ('name', 'text'), ('category', 'text'), ('sub_type', 'text'), ('year', 'integer'),
+        ('address', 'text'), ('description', 'text'), ('district', 'text')
+    ]
+}
 
+def point_import_row(category, props, year, district):
+    """Column values for one imported feature (without location / district_id)"""
+    if category == 'health':
+        return {
+            'name': props.get('name', 'Unknown'),
+            'type': props.get('type', 'Other'),
+            'youth_count': int(props.get('youth_count', 0)),
+            'total_members': int(props.get('total_members', 1)),
+            'year': int(props.get('year', year)),
+            'address': props.get('address'),
+            'description': props.get('description'),
+            'district': district
+        }
+    return {
+        'name': props.get('name', 'Unknown'),
+        'category': category,
+        'sub_type': props.get('sub_type') or props.get('type', ''),
+        'year': int(props.get('year', year)),
+        'address': props.get('address'),
+        'description': props.get('description'),
+        'district': district
+    }
+
+def insert_point_rows(table, rows, store_district_id):
+    """Insert a batch of rows (import columns plus lon/lat) with one INSERT ... SELECT
+    over json_to_recordset, i.e. the batch is staged as a single JSON parameter"""
+    columns = POINT_IMPORT_COLUMNS[table] + ([('district_id', 'integer')] if store_district_id else [])
+    names = ', '.join(column for column, _ in columns)
+    record = ', '.join(f'{column} {column_type}' for column, column_type in columns)
+    # ORM-side defaults (datetime.utcnow) are not applied to raw inserts; stamp UTC to match them
+    timestamps = table == 'health_platforms'
+    
+    db.session.execute(db.text(f"""
+        INSERT INTO {table} ({names}, location{', created_at, updated_at' if timestamps else ''})
+        SELECT {names}, ST_SetSRID(ST_MakePoint(lon, lat), 4326){", timezone('utc', now()), timezone('utc', now())" if timestamps else ''}
+        FROM json_to_recordset(CAST(:rows AS json)) AS r({record}, lon double precision, lat double precision)
+    """), {'rows': dumps_bytes(rows).decode()})
 
-def import_geojson_to_db(geojson_data, year, category='health', district=None):
-    """Import GeoJSON data into database"""
+def import_geojson_to_db(geojson_data, year, category='health', district=None, batch_size=None, progress=None):
+    """Import GeoJSON data into database
+    
+    Features are loaded in batches of batch_size (default IMPORT_BATCH_SIZE):
+    each batch is tagged with districts in memory (see tag_districts) and written
+    with one set-based INSERT. progress(rows=n) is called after every batch.
+    Returns (feature_count, outside_points) where outside_points lists the
+    names of points outside every district boundary.
+    """
+    batch_size = batch_size or IMPORT_BATCH_SIZE
     feature_count = 0
+    point_table = 'health_platforms' if category == 'health' else 'facilities'
+    # Facility features are skipped until the facilities table has been created
+    table_exists = category == 'health' or schema_registry.has_table('facilities')
     
     try:
-        for feature in geojson_data.get('features', []):
+        boundary_index = load_boundary_index()
+        store_district_id = district_ids_ready(point_table)
+        outside_points = []
+        rollup_cells = set()
+        batch = []
+        
+        def flush(batch):
+            if boundary_index is not None:
+                matches = tag_districts(boundary_index, [p[1] for p in batch], [p[2] for p in batch])
+            else:
+                matches = np.full(len(batch), -1)
+            
+            rows = []
+            for (props, lon, lat), match in zip(batch, matches):
+                district_id = district_name = None
+                if match >= 0:
+                    district_id = int(boundary_index.ids[match])
+                    district_name = boundary_index.names[match]
+                elif boundary_index is not None:
+                    outside_points.append(props.get('name', 'Unknown'))
+                
+                # Properties / form field win; the spatial match fills in a missing district
+                row = point_import_row(category, props, year, props.get('district', district) or district_name)
+                row.update(lon=lon, lat=lat)
+                if store_district_id:
+                    row['district_id'] = district_id
+                    rollup_cells.add((district_id, row['year']))
+                rows.append(row)
+            
+            if table_exists:
+                insert_point_rows(point_table, rows, store_district_id)
+            return len(rows)
+        
+        for feature in geojson_features(geojson_data):
             props = feature.get('properties', {})
             geometry = feature.get('geometry', {})
             
@@ -602,57 +1609,25 @@ def import_geojson_to_db(geojson_data, year, category='health', district=None):
             if len(coords) < 2:
                 continue
             
-            # Create WKT point
-            lon, lat = coords[0], coords[1]
-            wkt_point = f'POINT({lon} {lat})'
-            
-            # Determine which table to use
-            if category == 'health':
-                # Health platforms table
-                platform = HealthPlatform(
-                    name=props.get('name', 'Unknown'),
-                    type=props.get('type', 'Other'),
-                    youth_count=int(props.get('youth_count', 0)),
-                    total_members=int(props.get('total_members', 1)),
-                    year=int(props.get('year', year)),
-                    address=props.get('address'),
-                    description=props.get('description'),
-                    district=props.get('district', district),
-                    location=ST_GeomFromText(wkt_point, 4326)
-                )
-                db.session.add(platform)
-            else:
-                # Facilities table for schools, churches, police, shops, offices
-                from sqlalchemy import text, inspect
-                
-                # Check if facilities table exists
-                inspector = inspect(db.engine)
-                if 'facilities' in inspector.get_table_names():
-                    # Insert into facilities table
-                    insert_query = text("""
-                        INSERT INTO facilities 
-                        (name, category, sub_type, year, address, description, district, location)
-                        VALUES 
-                        (:name, :category, :sub_type, :year, :address, :description, :district, 
-                         ST_SetSRID(ST_MakePoint(:lon, :lat), 4326))
-                    """)
-                    
-                    db.session.execute(insert_query, {
-                        'name': props.get('name', 'Unknown'),
-                        'category': category,
-                        'sub_type': props.get('sub_type') or props.get('type', ''),
-                        'year': int(props.get('year', year)),
-                        'address': props.get('address'),
-                        'description': props.get('description'),
-                        'district': props.get('district', district),
-                        'lon': lon,
-                        'lat': lat
-                    })
-            
-            feature_count += 1
-        
+            batch.append((props, float(coords[0]), float(coords[1])))
+            if len(batch) >= batch_size:
+                feature_count += flush(batch)
+                batch = []
+                if progress:
+                    progress(rows=feature_count)
+        
+        if batch:
+            feature_count += flush(batch)
+            if progress:
+                progress(rows=feature_count)
+        
+        if outside_points:
+            print(f"{len(outside_points)} of {feature_count} points fall outside every district boundary")
+        
+        if table_exists:
+            update_district_rollups(point_table, rollup_cells)
         db.session.commit()
-        return feature_count
+        return feature_count, outside_points
     except Exception as e:
         db.session.rollback()
         import traceback
@@ -686,8 +1661,13 @@ def manage_platform(platform_id):
             platform.address = data['address']
         
         try:
+            db.session.flush()
+            update_district_rollups('health_platforms',
+                                    point_rollup_cells('health_platforms', 't.id = :id', {'id': platform_id}))
             db.session.commit()
             TrendData.update_trends()
+            data_changed('health_platforms', platform.year)
+            data_changed('trend_data')
             return jsonify(platform.to_dict())
         except Exception as e:
             db.session.rollback()
@@ -695,9 +1675,15 @@ def manage_platform(platform_id):
     
     elif request.method == 'DELETE':
         try:
+            platform_year = platform.year
+            cells = point_rollup_cells('health_platforms', 't.id = :id', {'id': platform_id})
             db.session.delete(platform)
+            db.session.flush()
+            update_district_rollups('health_platforms', cells)
             db.session.commit()
             TrendData.update_trends()
+            data_changed('health_platforms', platform_year)
+            data_changed('trend_data')
             return jsonify({"message": "Platform deleted successfully"})
         except Exception as e:
             db.session.rollback()
@@ -709,6 +1695,7 @@ def refresh_trends():
     """Manually refresh trend data"""
     try:
         TrendData.update_trends()
+        data_changed('trend_data')
         return jsonify({"message": "Trends updated successfully"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -776,6 +1763,19 @@ def initialize_tables():
         else:
             results.append("✅ Facilities table already exists")
         
+        # Indexes for filtered, keyset-paginated listings (see database/add_listing_indexes.sql)
+        try:
+            db.session.execute(db.text("CREATE INDEX IF NOT EXISTS idx_facilities_year_id ON facilities(year, id);"))
+            db.session.execute(db.text("CREATE INDEX IF NOT EXISTS idx_facilities_year_category_id ON facilities(year, category, id);"))
+            db.session.execute(db.text("CREATE INDEX IF NOT EXISTS idx_facilities_district ON facilities(district);"))
+            db.session.execute(db.text("CREATE INDEX IF NOT EXISTS idx_health_platforms_year_id ON health_platforms(year, id);"))
+            db.session.execute(db.text("CREATE INDEX IF NOT EXISTS idx_health_platforms_district ON health_platforms(district);"))
+            db.session.commit()
+            results.append("✅ Listing indexes ready")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Note: Could not create listing indexes: {e}")
+        
         # Check and create boundaries table
         if 'district_boundaries' not in inspector.get_table_names():
             results.append("Creating district_boundaries table...")
@@ -800,6 +1800,48 @@ def initialize_tables():
         else:
             results.append("✅ Boundaries table already exists")
         
+        # Simplified boundary tiers for low-zoom map views
+        try:
+            ensure_boundary_simplification_columns()
+            simplified = refresh_boundary_simplifications(only_missing=True)
+            db.session.commit()
+            results.append(f"✅ Boundary simplification tiers ready ({simplified} boundaries simplified)")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Note: Could not prepare boundary simplification tiers: {e}")
+        
+        # Subdivided boundary pieces (table comes from db.create_all; see database/add_boundary_pieces.sql)
+        schema_registry.refresh()
+        if boundary_pieces_ready():
+            try:
+                pieces = refresh_boundary_pieces(only_missing=True)
+                db.session.commit()
+                results.append(f"✅ Boundary pieces ready ({pieces} pieces written)")
+            except Exception as e:
+                db.session.rollback()
+                print(f"Note: Could not build boundary pieces: {e}")
+        
+        # Persisted district assignment for points (see database/add_district_ids.sql)
+        try:
+            for table in DISTRICT_POINT_TABLES:
+                db.session.execute(db.text(f"""
+                    ALTER TABLE {table} ADD COLUMN IF NOT EXISTS district_id INTEGER
+                    REFERENCES district_boundaries(id) ON DELETE SET NULL;
+                """))
+                db.session.execute(db.text(f"CREATE INDEX IF NOT EXISTS idx_{table}_year_district_id ON {table}(year, district_id);"))
+                assign_districts(table, 't.district_id IS NULL')
+            db.session.commit()
+            results.append("✅ District assignment ready for health platforms and facilities")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Note: Could not prepare district assignment: {e}")
+        
+        # Per-district rollups (table comes from db.create_all; see database/add_district_rollups.sql)
+        schema_registry.refresh()
+        refresh_district_rollups()
+        if district_rollups_ready():
+            results.append("✅ District rollups rebuilt")
+        
         # Add description columns if missing
         try:
             db.session.execute(db.text("ALTER TABLE health_platforms ADD COLUMN IF NOT EXISTS description TEXT;"))
@@ -809,6 +1851,8 @@ def initialize_tables():
         except:
             pass
         
+        schema_registry.refresh()
+        
         return jsonify({
             "message": "Database tables initialized successfully",
             "details": results
@@ -819,23 +1863,120 @@ def initialize_tables():
         return jsonify({"error": str(e), "message": "Error initializing tables"}), 500
 
 
+# Precomputed simplified boundary tiers: (column, highest zoom served, tolerance in degrees)
+# Ordered coarsest first; zooms above the last tier get the full-resolution boundary.
+BOUNDARY_SIMPLIFICATION_TIERS = [
+    ('boundary_simplified_z8', 8, 0.005),
+    ('boundary_simplified_z11', 11, 0.0005),
+    ('boundary_simplified_z14', 14, 0.00005),
+]
+
+
+def select_boundary_column(zoom=None, tolerance=None):
+    """Pick the boundary geometry column for a map zoom level or a maximum tolerance"""
+    if zoom is not None:
+        for column, max_zoom, _ in BOUNDARY_SIMPLIFICATION_TIERS:
+            if zoom <= max_zoom:
+                return column
+    elif tolerance is not None:
+        for column, _, tier_tolerance in BOUNDARY_SIMPLIFICATION_TIERS:
+            if tier_tolerance <= tolerance:
+                return column
+    return 'boundary'
+
+
+def boundary_geometry_sql(zoom=None, tolerance=None):
+    """SQL expression for the boundary geometry to render, falling back to full resolution
+    (also before add_boundary_simplification_tiers.sql has added the tier columns)"""
+    column = select_boundary_column(zoom, tolerance)
+    if column == 'boundary' or not schema_registry.has_column('district_boundaries', column):
+        return 'boundary'
+    return f"COALESCE({column}, boundary)"
+
+
+def ensure_boundary_simplification_columns():
+    """Add the simplified boundary tier columns to district_boundaries if missing"""
+    for column, _, _ in BOUNDARY_SIMPLIFICATION_TIERS:
+        db.session.execute(db.text(
+            f"ALTER TABLE district_boundaries ADD COLUMN IF NOT EXISTS {column} GEOMETRY(MultiPolygon, 4326)"
+        ))
+
+
+def refresh_boundary_simplifications(names=None, only_missing=False):
+    """Regenerate simplified boundary tiers from the full-resolution boundary.
+    
+    Uses ST_SimplifyPreserveTopology so every tier stays a valid polygon with
+    no collapsed rings. Limited to the given boundary names when provided.
+    """
+    assignments = ', '.join(
+        f"{column} = ST_Multi(ST_SimplifyPreserveTopology(boundary, {tolerance}))"
+        for column, _, tolerance in BOUNDARY_SIMPLIFICATION_TIERS
+    )
+    conditions = []
+    params = {}
+    if names is not None:
+        conditions.append("name = ANY(:names)")
+        params['names'] = list(names)
+    if only_missing:
+        conditions.append(' OR '.join(f"{column} IS NULL" for column, _, _ in BOUNDARY_SIMPLIFICATION_TIERS))
+    where = f"WHERE ({') AND ('.join(conditions)})" if conditions else ""
+    
+    result = db.session.execute(db.text(f"UPDATE district_boundaries SET {assignments} {where}"), params)
+    return result.rowcount
+
+
+def geojson_precision():
+    """Decimal digits for ST_AsGeoJSON from ?precision= (PostGIS default is 9)"""
+    precision = request.args.get('precision', type=int, default=9)
+    return min(max(precision, 0), 15)
+
+
+def wants_topojson():
+    return request.args.get('format', '').lower() == 'topojson'
+
+
+def boundaries_topojson(boundaries, include_properties=True):
+    """Move each boundary's geometry into a shared TopoJSON topology (?quantization=)"""
+    quantization = max(request.args.get('quantization', type=int, default=DEFAULT_QUANTIZATION), 2)
+    features = []
+    for boundary in boundaries:
+        geometry = boundary.pop('boundary', None)
+        features.append({
+            'id': boundary['id'],
+            'geometry': geometry,
+            'properties': boundary if include_properties else {}
+        })
+    return encode_topojson(features, object_name='boundaries', quantization=quantization)
+
+
 @app.route('/api/boundaries', methods=['GET'])
+@conditional_get('district_boundaries')
+@compressed_cache
 def get_boundaries():
-    """Get district boundaries"""
+    """Get district boundaries
+    
+    Optional ?zoom=<map zoom> or ?tolerance=<degrees> selects a precomputed
+    simplified geometry tier; without either the full-resolution boundary is returned.
+    ?precision=<digits> limits GeoJSON coordinate decimals, and ?format=topojson
+    returns a quantized Topology (properties on each geometry) instead of a list.
+    """
+    zoom = request.args.get('zoom', type=int)
+    tolerance = request.args.get('tolerance', type=float)
+    boundary_column = boundary_geometry_sql(zoom, tolerance)
+    precision = geojson_precision()
+    
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'district_boundaries' not in inspector.get_table_names():
-            return jsonify([])
+        if not schema_registry.has_table('district_boundaries'):
+            return no_store(jsonify([]))
         
-        query = db.text("""
+        query = db.text(f"""
             SELECT 
                 id,
                 name,
                 code,
                 population,
                 area_km2,
-                ST_AsGeoJSON(boundary) as boundary_geojson,
+                ST_AsGeoJSON({boundary_column}, :precision) as boundary_geojson,
                 ST_X(center_point) as center_lon,
                 ST_Y(center_point) as center_lat,
                 youth_rep_name,
@@ -845,28 +1986,33 @@ def get_boundaries():
             ORDER BY name
         """)
         
-        result = db.session.execute(query)
+        result = db.session.execute(query, {'precision': precision})
+        
+        # TopoJSON needs real coordinates; GeoJSON passes the PostGIS text through
+        load_geometry = json.loads if wants_topojson() else raw_json
         
         boundaries_list = []
         for row in result:
-            import json
             boundaries_list.append({
                 'id': row.id,
                 'name': row.name,
                 'code': row.code,
                 'population': row.population,
                 'area_km2': float(row.area_km2) if row.area_km2 else 0,
-                'boundary': json.loads(row.boundary_geojson),
+                'boundary': load_geometry(row.boundary_geojson),
                 'center': [row.center_lon, row.center_lat] if row.center_lon and row.center_lat else None,
                 'youth_rep_name': row.youth_rep_name,
                 'youth_rep_title': row.youth_rep_title,
                 'health_platforms': row.health_platforms or []
             })
         
+        if wants_topojson():
+            return jsonify(boundaries_topojson(boundaries_list))
+        
         return jsonify(boundaries_list)
     except Exception as e:
         print(f"Error fetching boundaries: {str(e)}")
-        return jsonify([])
+        return no_store(jsonify([]))
 
 
 @app.route('/api/boundaries/<int:boundary_id>', methods=['GET', 'PUT', 'DELETE'])
@@ -874,9 +2020,7 @@ def get_boundaries():
 def manage_boundary(boundary_id):
     """Get, update, or delete a specific boundary"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'district_boundaries' not in inspector.get_table_names():
+        if not schema_registry.has_table('district_boundaries'):
             return jsonify({"error": "Boundaries table does not exist"}), 404
         
         if request.method == 'GET':
@@ -900,14 +2044,13 @@ def manage_boundary(boundary_id):
             if not row:
                 return jsonify({"error": "Boundary not found"}), 404
             
-            import json
             return jsonify({
                 'id': row.id,
                 'name': row.name,
                 'code': row.code,
                 'population': row.population,
                 'area_km2': float(row.area_km2) if row.area_km2 else 0,
-                'boundary': json.loads(row.boundary_geojson),
+                'boundary': raw_json(row.boundary_geojson),
                 'center': [row.center_lon, row.center_lat] if row.center_lon and row.center_lat else None
             })
         
@@ -943,16 +2086,17 @@ def manage_boundary(boundary_id):
             
             db.session.execute(update_query, params)
             db.session.commit()
+            data_changed('district_boundaries')
             
             return jsonify({"message": "Boundary updated successfully"})
         
         elif request.method == 'DELETE':
             # Delete boundary
-            delete_query = db.text("DELETE FROM district_boundaries WHERE id = :id")
-            result = db.session.execute(delete_query, {'id': boundary_id})
+            deleted_count = delete_boundaries('b.id = :id', {'id': boundary_id})
             db.session.commit()
+            data_changed('district_boundaries')
             
-            if result.rowcount > 0:
+            if deleted_count > 0:
                 return jsonify({"message": "Boundary deleted successfully"})
             else:
                 return jsonify({"error": "Boundary not found"}), 404
@@ -969,20 +2113,15 @@ def manage_boundary(boundary_id):
 def delete_seed_boundaries():
     """Delete hardcoded seed boundaries (Mbare, Borrowdale, Harare Central, Glen View, Highfield, Avondale)"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'district_boundaries' not in inspector.get_table_names():
+        if not schema_registry.has_table('district_boundaries'):
             return jsonify({"error": "Boundaries table does not exist"}), 404
         
-        delete_query = db.text("""
-            DELETE FROM district_boundaries 
-            WHERE name IN ('Mbare', 'Borrowdale', 'Harare Central', 'Glen View', 'Highfield', 'Avondale')
-        """)
-        
-        result = db.session.execute(delete_query)
+        deleted_count = delete_boundaries(
+            "b.name IN ('Mbare', 'Borrowdale', 'Harare Central', 'Glen View', 'Highfield', 'Avondale')"
+        )
         db.session.commit()
+        data_changed('district_boundaries')
         
-        deleted_count = result.rowcount
         return jsonify({
             "message": f"Deleted {deleted_count} seed boundaries",
             "deleted": deleted_count
@@ -998,9 +2137,7 @@ def delete_seed_boundaries():
 def bulk_delete_boundaries():
     """Bulk delete boundaries by IDs"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'district_boundaries' not in inspector.get_table_names():
+        if not schema_registry.has_table('district_boundaries'):
             return jsonify({"error": "Boundaries table does not exist"}), 404
         
         data = request.json
@@ -1017,16 +2154,11 @@ def bulk_delete_boundaries():
         except (ValueError, TypeError):
             return jsonify({"error": "All IDs must be integers"}), 400
         
-        # Delete boundaries
-        delete_query = db.text("""
-            DELETE FROM district_boundaries 
-            WHERE id = ANY(:ids)
-        """)
-        
-        result = db.session.execute(delete_query, {'ids': ids})
+        # Delete boundaries (their points move to any remaining boundary covering them)
+        deleted_count = delete_boundaries('b.id = ANY(:ids)', {'ids': ids})
         db.session.commit()
+        data_changed('district_boundaries')
         
-        deleted_count = result.rowcount
         return jsonify({
             "message": f"Successfully deleted {deleted_count} boundar{'y' if deleted_count == 1 else 'ies'}",
             "deleted": deleted_count
@@ -1043,9 +2175,7 @@ def bulk_delete_boundaries():
 def get_districts_youth_info():
     """Get all districts with their youth representative information"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'district_boundaries' not in inspector.get_table_names():
+        if not schema_registry.has_table('district_boundaries'):
             return jsonify([])
         
         query = db.text("""
@@ -1091,9 +2221,7 @@ def get_districts_youth_info():
 def manage_district_youth_info(district_id):
     """Get or update youth representative information for a specific district"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'district_boundaries' not in inspector.get_table_names():
+        if not schema_registry.has_table('district_boundaries'):
             return jsonify({"error": "District boundaries table does not exist"}), 404
         
         if request.method == 'GET':
@@ -1163,6 +2291,7 @@ def manage_district_youth_info(district_id):
             
             db.session.execute(update_query, params)
             db.session.commit()
+            data_changed('district_boundaries')
             
             return jsonify({
                 "message": "District youth information updated successfully",
@@ -1181,11 +2310,9 @@ def manage_district_youth_info(district_id):
 def manage_district_youth_info_by_name(district_name):
     """Get or update youth representative information for a district by name"""
     try:
-        from sqlalchemy import inspect
         from urllib.parse import unquote
         
-        inspector = inspect(db.engine)
-        if 'district_boundaries' not in inspector.get_table_names():
+        if not schema_registry.has_table('district_boundaries'):
             return jsonify({"error": "District boundaries table does not exist"}), 404
         
         decoded_name = unquote(district_name)
@@ -1273,6 +2400,7 @@ def manage_district_youth_info_by_name(district_name):
             
             db.session.execute(update_query, params)
             db.session.commit()
+            data_changed('district_boundaries')
             
             return jsonify({
                 "message": f"Youth information for district '{district_name}' updated successfully",
@@ -1293,9 +2421,7 @@ def manage_district_youth_info_by_name(district_name):
 def get_youth_reps():
     """Get all youth representatives with their assigned districts"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'youth_representatives' not in inspector.get_table_names():
+        if not schema_registry.has_table('youth_representatives'):
             return jsonify([])
         
         query = db.text("""
@@ -1348,9 +2474,7 @@ def get_youth_reps():
 def create_youth_rep():
     """Create a new youth representative and assign to districts"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'youth_representatives' not in inspector.get_table_names():
+        if not schema_registry.has_table('youth_representatives'):
             return jsonify({"error": "Youth representatives table does not exist. Please run migration first."}), 500
         
         data = request.json
@@ -1412,9 +2536,7 @@ def create_youth_rep():
 def update_youth_rep(youth_rep_id):
     """Update a youth representative and their district assignments"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'youth_representatives' not in inspector.get_table_names():
+        if not schema_registry.has_table('youth_representatives'):
             return jsonify({"error": "Youth representatives table does not exist"}), 500
         
         data = request.json
@@ -1482,9 +2604,7 @@ def update_youth_rep(youth_rep_id):
 def delete_youth_rep(youth_rep_id):
     """Delete a youth representative (cascade will remove district assignments)"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'youth_representatives' not in inspector.get_table_names():
+        if not schema_registry.has_table('youth_representatives'):
             return jsonify({"error": "Youth representatives table does not exist"}), 500
         
         delete_query = db.text("DELETE FROM youth_representatives WHERE id = :id")
@@ -1507,9 +2627,7 @@ def delete_youth_rep(youth_rep_id):
 def get_districts():
     """Get all districts (for use in forms)"""
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'district_boundaries' not in inspector.get_table_names():
+        if not schema_registry.has_table('district_boundaries'):
             return jsonify([])
         
         query = db.text("""
@@ -1530,7 +2648,11 @@ def get_districts():
 @app.route('/api/upload-boundaries', methods=['POST'])
 @require_auth('editor')  # Require editor role or higher
 def upload_boundaries():
-    """Upload boundary files (Polygon or MultiPolygon geometries)"""
+    """Upload boundary files (Polygon or MultiPolygon geometries)
+    
+    Imported by a background job like /api/upload (202 with a job_id);
+    sync=true imports within the request.
+    """
     if 'file' not in request.files:
         return jsonify({"error": "No file provided"}), 400
     
@@ -1544,71 +2666,88 @@ def upload_boundaries():
     
     try:
         filename = secure_filename(file.filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
+        job_id = uuid.uuid4().hex
+        filepath = os.path.join(UPLOAD_FOLDER, f'{job_id}_{filename}')
         file.save(filepath)
         
+        if not wants_sync_upload():
+            submit_upload_job(job_id, 'boundaries', filename, filepath, process_boundary_upload, filename)
+            return jsonify({
+                "message": "Upload queued",
+                "job_id": job_id,
+                "status_url": f"/api/jobs/{job_id}",
+                "filename": filename
+            }), 202
+        
+        return jsonify(process_boundary_upload(filepath, filename))
+        
+    except UPLOAD_FORMAT_ERRORS as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        print(f"Error uploading boundaries: {error_details}")
+        return jsonify({"error": f"Error processing file: {str(e)}"}), 500
+
+
+def process_boundary_upload(filepath, filename, progress=None):
+    """Import a saved boundary upload; returns the upload result body"""
+    try:
         geojson_data = None
         
         # Process the file
         if filename.endswith('.geojson') or filename.endswith('.json'):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                geojson_data = json.load(f)
-            
-            if 'type' not in geojson_data or geojson_data['type'] != 'FeatureCollection':
-                return jsonify({"error": "Invalid GeoJSON format. Must be a FeatureCollection"}), 400
-            
+            # Boundaries are read one feature at a time by the importer
+            geojson_data = GeoJSONFeatureStream(filepath)
+        
         elif filename.endswith('.shp') or filename.endswith('.zip'):
             if filename.endswith('.zip'):
-                extract_folder = os.path.join(UPLOAD_FOLDER, 'temp_extract')
+                extract_folder = f'{filepath}_extract'
                 os.makedirs(extract_folder, exist_ok=True)
                 shutil.unpack_archive(filepath, extract_folder)
                 
                 shp_files = [f for f in os.listdir(extract_folder) if f.endswith('.shp')]
                 if not shp_files:
-                    return jsonify({"error": "No shapefile found in zip"}), 400
+                    raise UploadFormatError("No shapefile found in zip")
                 
                 shp_path = os.path.join(extract_folder, shp_files[0])
             else:
                 shp_path = filepath
             
-            # Read shapefile with geopandas (handles MultiPolygon automatically)
-            gdf = gpd.read_file(shp_path)
-            geojson_data = json.loads(gdf.to_json())
-            
-            if filename.endswith('.zip'):
-                shutil.rmtree(extract_folder)
+            # Read shapefile with geopandas (handles MultiPolygon automatically), a block of rows at a time
+            geojson_data = ShapefileFeatureStream(shp_path)
         
         # Import boundaries into database
-        feature_count = import_boundaries_to_db(geojson_data)
-        
-        # Cleanup uploaded file
-        os.remove(filepath)
-        
-        return jsonify({
-            "message": "Boundaries uploaded successfully",
-            "filename": filename,
-            "features": feature_count
-        })
-        
-    except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"Error uploading boundaries: {error_details}")
-        return jsonify({"error": f"Error processing file: {str(e)}"}), 500
+        feature_count = import_boundaries_to_db(geojson_data, progress=progress)
+        data_changed('district_boundaries')
+    finally:
+        # Cleanup uploaded file (also when the import fails)
+        discard_upload(filepath)
+    
+    return {
+        "message": "Boundaries uploaded successfully",
+        "filename": filename,
+        "features": feature_count
+    }
 
 
-def import_boundaries_to_db(geojson_data):
-    """Import boundary GeoJSON (Polygon/MultiPolygon) into district_boundaries table"""
-    from sqlalchemy import inspect, text
+def import_boundaries_to_db(geojson_data, progress=None):
+    """Import boundary GeoJSON (Polygon/MultiPolygon) into district_boundaries table
+    
+    progress(rows=n) is called after each boundary, progress(phase=...) before
+    the derived geometry is rebuilt.
+    """
+    from sqlalchemy import text
     
     feature_count = 0
+    imported_names = []
     
     # Check if table exists
-    inspector = inspect(db.engine)
-    if 'district_boundaries' not in inspector.get_table_names():
+    if not schema_registry.has_table('district_boundaries'):
         raise Exception("district_boundaries table does not exist. Please initialize tables first.")
     
-    for feature in geojson_data.get('features', []):
+    for feature in geojson_features(geojson_data):
         props = feature.get('properties', {})
         geometry = feature.get('geometry', {})
         
@@ -1670,7 +2809,7 @@ def import_boundaries_to_db(geojson_data):
         geometry_json = json.dumps(geometry)
         
         # Check if coordinates need transformation (detect projected vs geographic)
-        crs_info = geojson_data.get('crs', {})
+        crs_info = geojson_member(geojson_data, 'crs', {})
         sample_coord = None
         needs_transform = False
         source_srid = None
@@ -1775,6 +2914,9 @@ def import_boundaries_to_db(geojson_data):
         try:
             db.session.execute(insert_query, insert_params)
             feature_count += 1
+            imported_names.append(name)
+            if progress:
+                progress(rows=feature_count)
         except Exception as e:
             print(f"Error inserting boundary {name}: {str(e)}")
             import traceback
@@ -1782,7 +2924,19 @@ def import_boundaries_to_db(geojson_data):
             db.session.rollback()
             continue
     
+    if progress:
+        progress(phase='post-processing')
+    
     try:
+        # Regenerate simplified tiers for the boundaries that were just written
+        if imported_names:
+            ensure_boundary_simplification_columns()
+            refresh_boundary_simplifications(imported_names)
+            if boundary_pieces_ready():
+                refresh_boundary_pieces(imported_names)
+            reassign_districts_for_boundaries(imported_names)
+            # Reassignment moves points between districts anywhere in the city
+            rebuild_district_rollups()
         db.session.commit()
         print(f"Successfully imported {feature_count} boundaries")
     except Exception as e:
@@ -1790,12 +2944,506 @@ def import_boundaries_to_db(geojson_data):
         print(f"Error committing boundaries: {str(e)}")
         raise
     
-    return feature_count
+    return feature_count
+
+
+# Point tables with a persisted district_id (see database/add_district_ids.sql)
+DISTRICT_POINT_TABLES = ('health_platforms', 'facilities')
+
+def district_ids_ready(table):
+    """True once `table` has been migrated to carry district_id"""
+    return schema_registry.has_column(table, 'district_id')
+
+def containing_district_sql(point):
+    """SQL expression for the id of the district covering `point` (NULL if none).
+    
+    ST_Covers rather than ST_Contains so a point on a boundary edge (or on a cut
+    edge between pieces) still gets a district, the same as tag_districts.
+    """
+    if boundary_pieces_ready():
+        return f"""(
+            SELECT pc.boundary_id FROM district_boundary_pieces pc
+            WHERE ST_Covers(pc.geom, {point})
+            ORDER BY pc.boundary_id
+            LIMIT 1
+        )"""
+    return f"""(
+        SELECT b.id FROM district_boundaries b
+        WHERE ST_Covers(b.boundary, {point})
+        ORDER BY b.id
+        LIMIT 1
+    )"""
+
+def in_district_sql(point, boundary_condition):
+    """SQL condition: `point` lies in a district matching `boundary_condition` (on alias b)"""
+    if boundary_pieces_ready():
+        return f"""EXISTS (
+            SELECT 1 FROM district_boundary_pieces pc JOIN district_boundaries b ON b.id = pc.boundary_id
+            WHERE {boundary_condition} AND ST_Covers(pc.geom, {point})
+        )"""
+    return f"""EXISTS (
+        SELECT 1 FROM district_boundaries b
+        WHERE {boundary_condition} AND ST_Covers(b.boundary, {point})
+    )"""
+
+BoundaryIndex = namedtuple('BoundaryIndex', ['tree', 'ids', 'names'])
+
+def load_boundary_index():
+    """STRtree over the current district boundaries (ordered by id), or None if there are none"""
+    if not schema_registry.has_table('district_boundaries'):
+        return None
+    rows = db.session.execute(db.text(
+        "SELECT id, name, ST_AsBinary(boundary) AS wkb FROM district_boundaries WHERE boundary IS NOT NULL ORDER BY id"
+    )).fetchall()
+    if not rows:
+        return None
+    
+    geometries = shapely.from_wkb([bytes(row.wkb) for row in rows])
+    shapely.prepare(geometries)
+    return BoundaryIndex(shapely.STRtree(geometries), np.array([row.id for row in rows]), [row.name for row in rows])
+
+def tag_districts(boundary_index, lons, lats):
+    """Index into boundary_index of the district covering each point (-1 if none).
+    
+    A single bulk STRtree query for all points with the same covers test as the
+    SQL assignment, so a point on a shared edge goes to the boundary with the
+    lowest id either way.
+    """
+    points = shapely.points(np.asarray(lons, dtype=float), np.asarray(lats, dtype=float))
+    point_idx, boundary_idx = boundary_index.tree.query(points, predicate='covered_by')
+    
+    matches = np.full(len(points), -1)
+    if len(point_idx):
+        order = np.lexsort((boundary_idx, point_idx))
+        point_idx, boundary_idx = point_idx[order], boundary_idx[order]
+        _, first = np.unique(point_idx, return_index=True)
+        matches[point_idx[first]] = boundary_idx[first]
+    return matches
+
+def assign_districts(table, condition, params=None):
+    """Set district_id on the rows of a point table matching `condition` (alias t).
+    
+    One set-based UPDATE with a GIST-indexed containment lookup per point;
+    points outside every boundary get NULL. Does not commit.
+    """
+    result = db.session.execute(db.text(f"""
+        UPDATE {table} t
+        SET district_id = {containing_district_sql('t.location')}
+        WHERE {condition}
+    """), params or {})
+    return result.rowcount
+
+def reassign_districts_for_boundaries(names):
+    """Re-run the assignment for points that were in, or now fall in, the named boundaries"""
+    for table in DISTRICT_POINT_TABLES:
+        if not district_ids_ready(table):
+            continue
+        assigned = assign_districts(table, f"""
+            t.district_id IN (SELECT id FROM district_boundaries WHERE name = ANY(:names))
+            OR {in_district_sql('t.location', 'b.name = ANY(:names)')}
+        """, {'names': list(names)})
+        print(f"Reassigned districts for {assigned} {table} rows")
+
+def delete_boundaries(condition, params=None):
+    """Delete the district_boundaries rows matching `condition` (alias b) and move
+    their points to whichever remaining boundary covers them.
+    
+    Points would otherwise keep a NULL district_id (ON DELETE SET NULL) and drop
+    out of district summaries and rollups. Does not commit; returns the number
+    of boundaries deleted.
+    """
+    affected = {}
+    for table in DISTRICT_POINT_TABLES:
+        if district_ids_ready(table):
+            affected[table] = db.session.execute(db.text(f"""
+                SELECT t.id FROM {table} t
+                WHERE t.district_id IN (SELECT b.id FROM district_boundaries b WHERE {condition})
+            """), params or {}).scalars().all()
+    
+    result = db.session.execute(db.text(f"DELETE FROM district_boundaries b WHERE {condition}"), params or {})
+    
+    for table, ids in affected.items():
+        if not ids:
+            continue
+        point_params = {'point_ids': ids}
+        assign_districts(table, 't.id = ANY(:point_ids)', point_params)
+        update_district_rollups(table, point_rollup_cells(table, 't.id = ANY(:point_ids)', point_params))
+        print(f"Reassigned districts for {len(ids)} {table} rows of deleted boundaries")
+    prune_district_rollups()
+    return result.rowcount
+
+# Subdivided boundary pieces: ST_Subdivide splits each many-vertex suburb into small
+# polygons, so the GIST bbox filter passes few candidates and each exact test is cheap.
+# Pieces share cut edges, hence ST_Covers (not ST_Contains) when testing points.
+BOUNDARY_PIECE_MAX_VERTICES = int(os.getenv('BOUNDARY_PIECE_MAX_VERTICES', 64))
+
+def boundary_pieces_ready():
+    return schema_registry.has_table('district_boundary_pieces')
+
+def refresh_boundary_pieces(names=None, only_missing=False):
+    """Rebuild district_boundary_pieces for the named boundaries (all when None).
+    
+    With only_missing, only boundaries without pieces are processed. Does not
+    commit; returns the number of pieces written.
+    """
+    conditions = []
+    params = {'max_vertices': BOUNDARY_PIECE_MAX_VERTICES}
+    if names is not None:
+        conditions.append("b.name = ANY(:names)")
+        params['names'] = list(names)
+    if only_missing:
+        conditions.append("NOT EXISTS (SELECT 1 FROM district_boundary_pieces pc WHERE pc.boundary_id = b.id)")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    db.session.execute(db.text(f"""
+        DELETE FROM district_boundary_pieces
+        WHERE boundary_id IN (SELECT b.id FROM district_boundaries b {where})
+    """), params)
+    result = db.session.execute(db.text(f"""
+        INSERT INTO district_boundary_pieces (boundary_id, geom)
+        SELECT b.id, ST_Subdivide(b.boundary, :max_vertices)
+        FROM district_boundaries b
+        {where}
+    """), params)
+    return result.rowcount
+
+# Rollup SELECT per point table: (category, sub_type, youth sum, member sum) expressions
+DISTRICT_ROLLUP_SOURCES = {
+    'health_platforms': ("type", "''", "COALESCE(SUM(youth_count), 0)", "COALESCE(SUM(total_members), 0)"),
+    'facilities': ("category", "COALESCE(sub_type, '')", "0", "0")
+}
+
+def district_rollups_ready():
+    """True once district_rollups exists and every existing point table has district_id"""
+    return schema_registry.has_table('district_rollups') and all(
+        district_ids_ready(table) for table in DISTRICT_POINT_TABLES if schema_registry.has_table(table)
+    )
+
+def rebuild_district_rollups(tables=DISTRICT_POINT_TABLES):
+    """Recompute district_rollups for whole point tables in the caller's transaction.
+    
+    For writes that move many points between districts (boundary uploads) and
+    for initialize_tables. No commit; errors propagate to the caller.
+    """
+    if not district_rollups_ready():
+        return
+    db.session.execute(db.text("SELECT pg_advisory_xact_lock(hashtext('district_rollups'))"))
+    for table in tables:
+        if not schema_registry.has_table(table):
+            continue
+        category, sub_type, youth, members = DISTRICT_ROLLUP_SOURCES[table]
+        db.session.execute(db.text("DELETE FROM district_rollups WHERE source = :source"), {'source': table})
+        db.session.execute(db.text(f"""
+            INSERT INTO district_rollups
+                (district_id, year, source, category, sub_type, item_count, youth_count, total_members)
+            SELECT district_id, year, :source, {category}, {sub_type}, COUNT(*), {youth}, {members}
+            FROM {table}
+            WHERE district_id IS NOT NULL
+            GROUP BY 1, 2, 4, 5
+        """), {'source': table})
+
+def refresh_district_rollups():
+    """Rebuild every rollup and commit (initialize_tables); failures are logged"""
+    try:
+        rebuild_district_rollups()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Warning: Could not refresh district rollups: {e}")
+
+def point_rollup_cells(table, condition, params=None):
+    """(district_id, year) rollup cells of the rows of `table` (alias t) matching condition"""
+    if not district_rollups_ready():
+        return set()
+    rows = db.session.execute(db.text(f"""
+        SELECT DISTINCT t.district_id, t.year FROM {table} t
+        WHERE t.district_id IS NOT NULL AND ({condition})
+    """), params or {})
+    return {(row.district_id, row.year) for row in rows}
+
+def update_district_rollups(table, cells):
+    """Recompute the district_rollups rows of `table` for the given (district_id, year)
+    cells only, in the caller's transaction.
+    
+    Called before the write commits (collect cells before and after the change),
+    so a failure here fails the write and rollups never lag their data version.
+    """
+    cells = {(district_id, year) for district_id, year in cells if district_id is not None and year is not None}
+    if not cells or not district_rollups_ready():
+        return
+    category, sub_type, youth, members = DISTRICT_ROLLUP_SOURCES[table]
+    cell_filter = """(district_id, year) IN (
+        SELECT * FROM unnest(CAST(:district_ids AS integer[]), CAST(:years AS integer[]))
+    )"""
+    params = {
+        'source': table,
+        'district_ids': [district_id for district_id, _ in cells],
+        'years': [year for _, year in cells]
+    }
+    
+    db.session.execute(db.text("SELECT pg_advisory_xact_lock(hashtext('district_rollups'))"))
+    db.session.execute(db.text(f"""
+        DELETE FROM district_rollups WHERE source = :source AND {cell_filter}
+    """), params)
+    db.session.execute(db.text(f"""
+        INSERT INTO district_rollups
+            (district_id, year, source, category, sub_type, item_count, youth_count, total_members)
+        SELECT district_id, year, :source, {category}, {sub_type}, COUNT(*), {youth}, {members}
+        FROM {table}
+        WHERE {cell_filter}
+        GROUP BY 1, 2, 4, 5
+    """), params)
+
+def prune_district_rollups():
+    """Drop rollup rows of deleted boundaries, in the caller's transaction (their points
+    lose their district_id through ON DELETE SET NULL)"""
+    if not district_rollups_ready():
+        return
+    db.session.execute(db.text("""
+        DELETE FROM district_rollups r
+        WHERE NOT EXISTS (SELECT 1 FROM district_boundaries b WHERE b.id = r.district_id)
+    """))
+
+def district_statistics(category_counts, school_subtypes, clinic_subtypes,
+                        platform_count, platform_youth, platform_members):
+    """The statistics block of a district summary"""
+    facility_count = sum(category_counts.values())
+    return {
+        'health_platforms': platform_count,
+        'platform_youth_count': platform_youth,
+        'platform_total_members': platform_members,
+        'clinics': category_counts.get('health', 0),
+        'schools': category_counts.get('school', 0),
+        'churches': category_counts.get('church', 0),
+        'police': category_counts.get('police', 0),
+        'shops': category_counts.get('shop', 0),
+        'offices': category_counts.get('office', 0),
+        'school_primary': school_subtypes.get('primary', 0),
+        'school_secondary': school_subtypes.get('secondary', 0),
+        'school_tertiary': school_subtypes.get('tertiary', 0),
+        'clinic_pharmacy': clinic_subtypes.get('pharmacy', 0),
+        'clinic_hospital': clinic_subtypes.get('hospital', 0),
+        'clinic_clinic': clinic_subtypes.get('clinic', 0),
+        'total_facilities': facility_count + platform_count
+    }
+
+def district_rollup_statistics(boundary_id, year):
+    """Statistics block for one district and year from district_rollups (one indexed query)"""
+    rows = db.session.execute(db.text("""
+        SELECT source, category, sub_type, item_count, youth_count, total_members
+        FROM district_rollups
+        WHERE district_id = :boundary_id AND year = :year
+    """), {'boundary_id': boundary_id, 'year': year})
+    
+    category_counts = {}
+    school_subtypes = {}
+    clinic_subtypes = {}
+    platform_count = platform_youth = platform_members = 0
+    for row in rows:
+        if row.source == 'health_platforms':
+            platform_count += row.item_count
+            platform_youth += int(row.youth_count)
+            platform_members += int(row.total_members)
+            continue
+        category_counts[row.category] = category_counts.get(row.category, 0) + row.item_count
+        if row.category == 'school' and row.sub_type:
+            school_subtypes[row.sub_type] = school_subtypes.get(row.sub_type, 0) + row.item_count
+        if row.category == 'health' and row.sub_type:
+            clinic_subtypes[row.sub_type] = clinic_subtypes.get(row.sub_type, 0) + row.item_count
+    
+    return district_statistics(category_counts, school_subtypes, clinic_subtypes,
+                               platform_count, platform_youth, platform_members)
+
+# Per-district summaries keyed by (year, boundary id, data versions). Versions make
+# entries from before a write unreachable on every worker; writes also evict the
+# affected year locally, and uploads re-warm every district in the background.
+DISTRICT_SUMMARY_TABLES = ('district_boundaries', 'health_platforms', 'facilities')
+DISTRICT_SUMMARY_TTL = int(os.getenv('DISTRICT_SUMMARY_TTL', 3600))
+district_summary_cache = TTLCache(DISTRICT_SUMMARY_TTL)
+
+def district_data_versions():
+    versions = DataVersion.get_versions(DISTRICT_SUMMARY_TABLES)
+    return tuple(versions[table] for table in DISTRICT_SUMMARY_TABLES)
+
+def find_district_boundary(district_name, decoded_name):
+    """Boundary row for a district name (case-insensitive, also tries the URL-decoded name)"""
+    boundary_query = db.text("""
+        SELECT id, name, code, population, area_km2
+        FROM district_boundaries
+        WHERE LOWER(TRIM(name)) = LOWER(TRIM(:district_name))
+           OR LOWER(TRIM(name)) = LOWER(TRIM(:decoded_name))
+        LIMIT 1
+    """)
+    
+    return db.session.execute(boundary_query, {
+        'district_name': district_name,
+        'decoded_name': decoded_name
+    }).fetchone()
+
+def build_district_summary(boundary_row, year):
+    """Facilities, health platforms and statistics inside one district boundary"""
+    boundary_id = boundary_row.id
+    boundary_population = boundary_row.population
+    boundary_area = float(boundary_row.area_km2) if boundary_row.area_km2 else None
+    
+    # Points carry a persisted district_id once migrated; fall back to a spatial test before that
+    if district_ids_ready('health_platforms'):
+        health_membership = "hp.district_id = :boundary_id"
+    else:
+        health_membership = in_district_sql('hp.location', 'b.id = :boundary_id')
+    if district_ids_ready('facilities'):
+        facility_membership = "f.district_id = :boundary_id"
+    else:
+        facility_membership = in_district_sql('f.location', 'b.id = :boundary_id')
+    
+    # Get health platforms within the boundary
+    health_query = db.text(f"""
+        SELECT 
+            hp.id, 
+            hp.name, 
+            hp.type as category, 
+            hp.youth_count, 
+            hp.total_members,
+            hp.address,
+            hp.description,
+            ST_X(hp.location) as longitude,
+            ST_Y(hp.location) as latitude
+        FROM health_platforms hp
+        WHERE hp.year = :year
+          AND {health_membership}
+        ORDER BY hp.name
+    """)
+    
+    health_result = db.session.execute(health_query, {'boundary_id': boundary_id, 'year': year})
+    health_platforms = []
+    for row in health_result:
+        health_platforms.append({
+            'id': row.id,
+            'name': row.name,
+            'category': row.category,
+            'type': row.category,
+            'youth_count': row.youth_count,
+            'total_members': row.total_members,
+            'address': row.address,
+            'description': row.description,
+            'latitude': float(row.latitude) if row.latitude else None,
+            'longitude': float(row.longitude) if row.longitude else None
+        })
+    
+    # Get all facilities within the boundary
+    facilities_query = db.text(f"""
+        SELECT 
+            f.id, 
+            f.name, 
+            f.category, 
+            f.sub_type,
+            f.address,
+            f.description,
+            f.district,
+            ST_X(f.location) as longitude,
+            ST_Y(f.location) as latitude
+        FROM facilities f
+        WHERE f.year = :year
+          AND {facility_membership}
+        ORDER BY f.category, f.name
+    """)
+    
+    facilities_result = db.session.execute(facilities_query, {'boundary_id': boundary_id, 'year': year})
+    facilities = []
+    for row in facilities_result:
+        facilities.append({
+            'id': row.id,
+            'name': row.name,
+            'category': row.category,
+            'sub_type': row.sub_type,
+            'address': row.address,
+            'description': row.description,
+            'district': row.district,
+            'latitude': float(row.latitude) if row.latitude else None,
+            'longitude': float(row.longitude) if row.longitude else None
+        })
+    
+    # Statistics come from the maintained rollups; count in Python until they are migrated
+    if district_rollups_ready():
+        statistics = district_rollup_statistics(boundary_id, year)
+    else:
+        category_counts = {}
+        school_subtypes = {}
+        clinic_subtypes = {}
+        
+        for facility in facilities:
+            category = facility['category']
+            category_counts[category] = category_counts.get(category, 0) + 1
+            
+            if category == 'school' and facility.get('sub_type'):
+                sub_type = facility['sub_type']
+                school_subtypes[sub_type] = school_subtypes.get(sub_type, 0) + 1
+            
+            if category == 'health' and facility.get('sub_type'):
+                sub_type = facility['sub_type']
+                clinic_subtypes[sub_type] = clinic_subtypes.get(sub_type, 0) + 1
+        
+        statistics = district_statistics(
+            category_counts, school_subtypes, clinic_subtypes, len(health_platforms),
+            sum(p['youth_count'] or 0 for p in health_platforms),
+            sum(p['total_members'] or 0 for p in health_platforms)
+        )
+    
+    return {
+        'district': boundary_row.name,
+        'district_code': boundary_row.code,
+        'year': year,
+        'boundary_info': {
+            'population': int(boundary_population) if boundary_population else None,
+            'area_km2': boundary_area,
+            'code': boundary_row.code
+        },
+        'health_platforms': health_platforms,
+        'facilities': facilities,
+        'statistics': statistics
+    }
+
+def evict_district_summaries(table, year=None):
+    """Drop cached summaries a write to `table` may have changed"""
+    if table == 'district_boundaries':
+        district_summary_cache.evict('boundary')
+        district_summary_cache.evict('summary')
+    elif table in DISTRICT_SUMMARY_TABLES:
+        if year is None:
+            district_summary_cache.evict('summary')
+        else:
+            district_summary_cache.evict('summary', year)
+
+def warm_district_summaries(year):
+    """Precompute every district's summary for `year` on the shared warming thread"""
+    def run():
+        with app.app_context():
+            try:
+                versions = district_data_versions()
+                boundaries = db.session.execute(db.text(
+                    "SELECT id, name, code, population, area_km2 FROM district_boundaries"
+                )).fetchall()
+                for boundary_row in boundaries:
+                    district_summary_cache.get_or_compute(
+                        ('summary', year, boundary_row.id, versions),
+                        lambda: build_district_summary(boundary_row, year)
+                    )
+                print(f"Warmed district summaries for {len(boundaries)} districts ({year})")
+            except Exception as e:
+                print(f"Warning: Could not warm district summaries for {year}: {e}")
+            finally:
+                db.session.remove()
+    
+    submit_warm(('district_summaries', year), run)
 
 
 @app.route('/api/district/<district_name>/facilities', methods=['GET'])
 def get_district_facilities(district_name):
-    """Get all facilities within a specific district using spatial queries"""
+    """Get all facilities within a specific district using spatial queries
+    
+    Summaries are served from district_summary_cache while the underlying
+    tables are unchanged, so repeat clicks cost one data_versions lookup.
+    """
     year = request.args.get('year', type=int, default=get_current_year())
     
     try:
@@ -1804,19 +3452,20 @@ def get_district_facilities(district_name):
         from urllib.parse import unquote
         decoded_name = unquote(district_name)
         
-        boundary_query = db.text("""
-            SELECT id, name, code, population, area_km2, boundary
-            FROM district_boundaries
-            WHERE LOWER(TRIM(name)) = LOWER(TRIM(:district_name))
-               OR LOWER(TRIM(name)) = LOWER(TRIM(:decoded_name))
-            LIMIT 1
-        """)
+        try:
+            versions = district_data_versions()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Warning: Could not read data versions: {e}")
+            versions = None
         
-        boundary_result = db.session.execute(boundary_query, {
-            'district_name': district_name,
-            'decoded_name': decoded_name
-        })
-        boundary_row = boundary_result.fetchone()
+        if versions is None:
+            boundary_row = find_district_boundary(district_name, decoded_name)
+        else:
+            boundary_row = district_summary_cache.get_or_compute(
+                ('boundary', versions[0], district_name.strip().lower(), decoded_name.strip().lower()),
+                lambda: find_district_boundary(district_name, decoded_name)
+            )
         
         if not boundary_row:
             # Try to find similar names for better error message
@@ -1844,133 +3493,15 @@ def get_district_facilities(district_name):
                 'health_platforms': []
             }), 404
         
-        boundary_id = boundary_row.id
-        boundary_population = boundary_row.population
-        boundary_area = float(boundary_row.area_km2) if boundary_row.area_km2 else None
-        
-        # Get health platforms within the boundary using spatial query
-        # Using ST_Contains with the actual boundary polygon (not bounding box)
-        # Optimized: Use JOIN instead of CROSS JOIN, and ensure spatial index is used
-        health_query = db.text("""
-            SELECT 
-                hp.id, 
-                hp.name, 
-                hp.type as category, 
-                hp.youth_count, 
-                hp.total_members,
-                hp.address,
-                hp.description,
-                ST_X(hp.location) as longitude,
-                ST_Y(hp.location) as latitude
-            FROM health_platforms hp
-            JOIN district_boundaries db ON db.id = :boundary_id
-            WHERE hp.year = :year
-              AND ST_Contains(db.boundary, hp.location)
-            ORDER BY hp.name
-        """)
-        
-        health_result = db.session.execute(health_query, {'boundary_id': boundary_id, 'year': year})
-        health_platforms = []
-        for row in health_result:
-            health_platforms.append({
-                'id': row.id,
-                'name': row.name,
-                'category': row.category,
-                'type': row.category,
-                'youth_count': row.youth_count,
-                'total_members': row.total_members,
-                'address': row.address,
-                'description': row.description,
-                'latitude': float(row.latitude) if row.latitude else None,
-                'longitude': float(row.longitude) if row.longitude else None
-            })
-        
-        # Get all facilities within the boundary using spatial query
-        # Using ST_Contains with the actual boundary polygon (not bounding box)
-        # Optimized: Use JOIN instead of CROSS JOIN for better performance
-        facilities_query = db.text("""
-            SELECT 
-                f.id, 
-                f.name, 
-                f.category, 
-                f.sub_type,
-                f.address,
-                f.description,
-                f.district,
-                ST_X(f.location) as longitude,
-                ST_Y(f.location) as latitude
-            FROM facilities f
-            JOIN district_boundaries db ON db.id = :boundary_id
-            WHERE f.year = :year
-              AND ST_Contains(db.boundary, f.location)
-            ORDER BY f.category, f.name
-        """)
-        
-        facilities_result = db.session.execute(facilities_query, {'boundary_id': boundary_id, 'year': year})
-        facilities = []
-        for row in facilities_result:
-            facilities.append({
-                'id': row.id,
-                'name': row.name,
-                'category': row.category,
-                'sub_type': row.sub_type,
-                'address': row.address,
-                'description': row.description,
-                'district': row.district,
-                'latitude': float(row.latitude) if row.latitude else None,
-                'longitude': float(row.longitude) if row.longitude else None
-            })
-        
-        # Calculate statistics
-        category_counts = {}
-        school_subtypes = {}
-        clinic_subtypes = {}
-        
-        for facility in facilities:
-            category = facility['category']
-            category_counts[category] = category_counts.get(category, 0) + 1
-            
-            if category == 'school' and facility.get('sub_type'):
-                sub_type = facility['sub_type']
-                school_subtypes[sub_type] = school_subtypes.get(sub_type, 0) + 1
-            
-            if category == 'health' and facility.get('sub_type'):
-                sub_type = facility['sub_type']
-                clinic_subtypes[sub_type] = clinic_subtypes.get(sub_type, 0) + 1
-        
-        # Calculate total population from facilities if available
-        total_population = boundary_population  # Use boundary population as base
-        
-        summary = {
-            'district': district_name,
-            'district_code': boundary_row.code,
-            'year': year,
-            'boundary_info': {
-                'population': int(boundary_population) if boundary_population else None,
-                'area_km2': boundary_area,
-                'code': boundary_row.code
-            },
-            'health_platforms': health_platforms,
-            'facilities': facilities,
-            'statistics': {
-                'health_platforms': len(health_platforms),
-                'clinics': category_counts.get('health', 0),
-                'schools': category_counts.get('school', 0),
-                'churches': category_counts.get('church', 0),
-                'police': category_counts.get('police', 0),
-                'shops': category_counts.get('shop', 0),
-                'offices': category_counts.get('office', 0),
-                'school_primary': school_subtypes.get('primary', 0),
-                'school_secondary': school_subtypes.get('secondary', 0),
-                'school_tertiary': school_subtypes.get('tertiary', 0),
-                'clinic_pharmacy': clinic_subtypes.get('pharmacy', 0),
-                'clinic_hospital': clinic_subtypes.get('hospital', 0),
-                'clinic_clinic': clinic_subtypes.get('clinic', 0),
-                'total_facilities': len(facilities) + len(health_platforms)
-            }
-        }
+        if versions is None:
+            summary = build_district_summary(boundary_row, year)
+        else:
+            summary = district_summary_cache.get_or_compute(
+                ('summary', year, boundary_row.id, versions),
+                lambda: build_district_summary(boundary_row, year)
+            )
         
-        return jsonify(summary)
+        return jsonify(dict(summary, district=district_name))
     except Exception as e:
         print(f"Error fetching district facilities: {str(e)}")
         import traceback
@@ -1980,7 +3511,11 @@ def get_district_facilities(district_name):
 
 @app.route('/api/search', methods=['GET'])
 def advanced_search():
-    """Advanced search endpoint with autocomplete and filters"""
+    """Advanced search endpoint with autocomplete and filters
+    
+    Boundary geometry honours ?precision=; with ?format=topojson it is moved
+    out of each boundary into results['topology'] (geometries keyed by boundary id).
+    """
     query = request.args.get('q', '').strip()
     suburb = request.args.get('suburb', '').strip()
     facility_type = request.args.get('facility_type', '').strip()
@@ -2009,7 +3544,7 @@ def advanced_search():
                     area_km2,
                     ST_X(center_point) as center_lon,
                     ST_Y(center_point) as center_lat,
-                    ST_AsGeoJSON(boundary) as boundary_geojson
+                    ST_AsGeoJSON(boundary, :precision) as boundary_geojson
                 FROM district_boundaries
                 WHERE (:query = '' OR LOWER(name) LIKE '%' || LOWER(:query) || '%')
                   AND (:suburb = '' OR LOWER(name) = LOWER(:suburb))
@@ -2023,9 +3558,10 @@ def advanced_search():
             boundary_result = db.session.execute(boundary_query, {
                 'query': query if not suburb else suburb,
                 'suburb': suburb,
-                'limit': limit
+                'limit': limit,
+                'precision': geojson_precision()
             })
-            import json
+            load_geometry = json.loads if wants_topojson() else raw_json
             results['boundaries'] = []
             for row in boundary_result:
                 boundary_data = {
@@ -2041,10 +3577,13 @@ def advanced_search():
                 # Include boundary geometry for fitting bounds
                 if row.boundary_geojson:
                     try:
-                        boundary_data['boundary'] = json.loads(row.boundary_geojson)
+                        boundary_data['boundary'] = load_geometry(row.boundary_geojson)
                     except:
                         pass
                 results['boundaries'].append(boundary_data)
+            
+            if wants_topojson():
+                results['topology'] = boundaries_topojson(results['boundaries'], include_properties=False)
         
         # Search health platforms
         health_conditions = ["hp.year = :year"]
@@ -2244,11 +3783,60 @@ def search_autocomplete():
         return jsonify({'suggestions': []})
 
 
+# Properties of a facilities row (aliased as f) for single-point cells of ?cluster= responses
+FACILITY_PROPERTIES_SQL = """
+    json_build_object(
+        'id', f.id,
+        'name', f.name,
+        'category', f.category,
+        'sub_type', f.sub_type,
+        'year', f.year,
+        'address', f.address,
+        'description', f.description,
+        'additional_info', f.additional_info
+    )
+"""
+
+
+def facility_row_to_dict(row):
+    """Convert a facilities query row to the /api/facilities JSON shape"""
+    return {
+        'id': row.id,
+        'name': row.name,
+        'category': row.category,
+        'sub_type': row.sub_type,
+        'year': row.year,
+        'address': row.address,
+        'description': getattr(row, 'description', None),  # Add description if exists
+        'location': {
+            'coordinates': [row.longitude, row.latitude]
+        },
+        'longitude': row.longitude,
+        'latitude': row.latitude,
+        'additional_info': row.additional_info
+    }
+
+
 @app.route('/api/facilities', methods=['GET'])
+@conditional_get('facilities')
+@compressed_cache
 def get_facilities():
-    """Get all community facilities (schools, churches, police, shops, offices)"""
+    """Get all community facilities (schools, churches, police, shops, offices)
+    
+    Optional filters: ?bbox=minx,miny,maxx,maxy, ?category=, ?sub_type= and
+    ?district= (repeatable or comma-separated), and keyset paging with
+    ?after_id=&limit= (next cursor in the X-Next-After-Id header).
+    ?format=arrow|fgb returns Arrow IPC or FlatGeobuf instead of JSON.
+    ?cluster=<zoom> returns grid clusters with per-category counts (GeoJSON)
+    below street zoom.
+    """
     year = request.args.get('year', type=int)
-    category = request.args.get('category')  # Optional filter by category
+    
+    try:
+        conditions, params = listing_filters('f', {'category': 'category', 'sub_type': 'sub_type', 'district': 'district'})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    limit = page_limit()
     
     if not year:
         years = db.session.query(db.func.max(db.text('year'))).select_from(db.text('facilities')).scalar()
@@ -2256,13 +3844,22 @@ def get_facilities():
     
     try:
         # Check if facilities table exists
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        if 'facilities' not in inspector.get_table_names():
+        if not schema_registry.has_table('facilities'):
             # Return empty array if table doesn't exist yet
-            return jsonify([])
+            return no_store(jsonify([]))
         
-        query = db.text("""
+        conditions.insert(0, "f.year = :year")
+        params['year'] = year
+        
+        zoom = cluster_zoom()
+        if zoom is not None:
+            return cluster_response('facilities', 'f', 'category', conditions, params, zoom,
+                                    FACILITY_PROPERTIES_SQL)
+        
+        if limit:
+            params['limit'] = limit
+        
+        query = db.text(f"""
             SELECT 
                 id,
                 name,
@@ -2274,49 +3871,31 @@ def get_facilities():
                 ST_X(location) as longitude,
                 ST_Y(location) as latitude,
                 additional_info
-            FROM facilities
-            WHERE year = :year
+            FROM facilities f
+            WHERE {' AND '.join(conditions)}
+            ORDER BY f.id
+            {'LIMIT :limit' if limit else ''}
         """)
         
-        params = {'year': year}
-        
-        if category:
-            query = db.text("""
-                SELECT 
-                    id,
-                    name,
-                    category,
-                    sub_type,
-                    year,
-                    address,
-                    description,
-                    ST_X(location) as longitude,
-                    ST_Y(location) as latitude,
-                    additional_info
-                FROM facilities
-                WHERE year = :year AND category = :category
+        fmt = binary_format()
+        if fmt:
+            binary_query = db.text(f"""
+                SELECT id, name, category, sub_type, year, address, description,
+                       additional_info::text AS additional_info,
+                       ST_AsBinary(location) AS geometry
+                FROM facilities f
+                WHERE {' AND '.join(conditions)}
+                ORDER BY f.id
+                {'LIMIT :limit' if limit else ''}
             """)
-            params['category'] = category
+            return binary_response(binary_query, params, fmt, f'facilities_{year}', limit)
+        
+        if wants_stream():
+            return stream_json_array(query, params, lambda row: dumps_bytes(facility_row_to_dict(row)).decode())
         
         result = db.session.execute(query, params)
         
-        facilities_list = []
-        for row in result:
-            facilities_list.append({
-                'id': row.id,
-                'name': row.name,
-                'category': row.category,
-                'sub_type': row.sub_type,
-                'year': row.year,
-                'address': row.address,
-                'description': getattr(row, 'description', None),  # Add description if exists
-                'location': {
-                    'coordinates': [row.longitude, row.latitude]
-                },
-                'longitude': row.longitude,
-                'latitude': row.latitude,
-                'additional_info': row.additional_info
-            })
+        facilities_list = [facility_row_to_dict(row) for row in result]
         
         # Log for debugging
         print(f"Found {len(facilities_list)} facilities for year {year}")
@@ -2327,11 +3906,14 @@ def get_facilities():
                 if f['category'] == 'police':
                     print(f"  - {f['name']}: lat={f['latitude']}, lon={f['longitude']}")
         
-        return jsonify(facilities_list)
+        response = jsonify(facilities_list)
+        if limit and len(facilities_list) == limit:
+            response.headers['X-Next-After-Id'] = str(facilities_list[-1]['id'])
+        return response
     except Exception as e:
         # Return empty array if error (table might not exist yet)
         print(f"Error fetching facilities: {str(e)}")
-        return jsonify([])
+        return no_store(jsonify([]))
 
 
 @app.route('/api/facility/<int:facility_id>', methods=['GET', 'PUT', 'DELETE'])
@@ -2339,10 +3921,9 @@ def get_facilities():
 def manage_facility(facility_id):
     """Get, update, or delete a specific facility"""
     try:
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
+        from sqlalchemy import text
         
-        if 'facilities' not in inspector.get_table_names():
+        if not schema_registry.has_table('facilities'):
             return jsonify({"error": "Facilities table does not exist"}), 404
         
         if request.method == 'GET':
@@ -2376,6 +3957,9 @@ def manage_facility(facility_id):
         
         elif request.method == 'PUT':
             data = request.json
+            previous_year = db.session.execute(
+                db.text("SELECT year FROM facilities WHERE id = :id"), {'id': facility_id}
+            ).scalar()
             
             # Build update query dynamically
             updates = []
@@ -2418,8 +4002,17 @@ def manage_facility(facility_id):
                 WHERE id = :id
             """)
             
+            # Rollup cells the facility leaves and enters
+            cells = point_rollup_cells('facilities', 't.id = :id', {'id': facility_id})
             db.session.execute(update_query, params)
+            if 'lon' in params and district_ids_ready('facilities'):
+                assign_districts('facilities', 't.id = :id', {'id': facility_id})
+            cells |= point_rollup_cells('facilities', 't.id = :id', {'id': facility_id})
+            update_district_rollups('facilities', cells)
             db.session.commit()
+            data_changed('facilities', previous_year)
+            if params.get('year') and params['year'] != previous_year:
+                data_changed('facilities', params['year'])
             
             # Return updated facility
             query = db.text("""
@@ -2446,9 +4039,13 @@ def manage_facility(facility_id):
             })
         
         elif request.method == 'DELETE':
-            delete_query = db.text("DELETE FROM facilities WHERE id = :id")
-            db.session.execute(delete_query, {'id': facility_id})
+            cells = point_rollup_cells('facilities', 't.id = :id', {'id': facility_id})
+            delete_query = db.text("DELETE FROM facilities WHERE id = :id RETURNING year")
+            deleted_year = db.session.execute(delete_query, {'id': facility_id}).scalar()
+            update_district_rollups('facilities', cells)
             db.session.commit()
+            if deleted_year is not None:
+                data_changed('facilities', deleted_year)
             return jsonify({"message": "Facility deleted successfully"})
     
     except Exception as e:
@@ -2456,14 +4053,628 @@ def manage_facility(facility_id):
         return jsonify({"error": str(e)}), 500
 
 
+# Nearest facilities (KNN)
+NEAREST_DEFAULT_K = 10
+NEAREST_MAX_K = 100
+# <-> orders by planar distance in degrees; fetch extra candidates per table so the
+# re-rank by metres is not skewed by the shorter east-west degree at Harare's latitude
+NEAREST_CANDIDATE_FACTOR = 4
+
+@app.route('/api/nearest', methods=['GET'])
+def get_nearest():
+    """k nearest facilities and health platforms to ?lon=&lat=, with distances in metres
+    
+    Optional filters: ?category= ('health' selects health platforms), ?sub_type=
+    (facility sub_type / platform type), ?year= (defaults to each table's latest
+    year) and ?k= (default 10, max 100). Each table is answered by an index-assisted
+    KNN scan (ORDER BY location <-> point LIMIT n on the GIST location index).
+    """
+    lon = request.args.get('lon', type=float)
+    lat = request.args.get('lat', type=float)
+    if lon is None or lat is None:
+        return jsonify({"error": "lon and lat are required"}), 400
+    if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+        return jsonify({"error": "lon/lat out of range"}), 400
+    
+    k = request.args.get('k', NEAREST_DEFAULT_K, type=int)
+    k = max(1, min(k, NEAREST_MAX_K))
+    year = request.args.get('year', type=int)
+    categories = multi_value_arg('category')
+    sub_types = multi_value_arg('sub_type')
+    
+    try:
+        params = {'lon': lon, 'lat': lat, 'k': k, 'candidates': k * NEAREST_CANDIDATE_FACTOR}
+        branches = []
+        
+        facility_categories = [c for c in categories if c != 'health']
+        if schema_registry.has_table('facilities') and (not categories or facility_categories):
+            facility_years = cached_facility_years()
+            params['facility_year'] = year or (facility_years[-1] if facility_years else get_current_year())
+            conditions = ["f.year = :facility_year"]
+            if facility_categories:
+                conditions.append("f.category = ANY(:facility_categories)")
+                params['facility_categories'] = facility_categories
+            if sub_types:
+                conditions.append("f.sub_type = ANY(:sub_types)")
+            branches.append(f"""
+                (SELECT 'facility' AS source, f.id, f.name, f.category, f.sub_type, f.year, f.district, f.location
+                 FROM facilities f
+                 WHERE {' AND '.join(conditions)}
+                 ORDER BY f.location <-> ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)
+                 LIMIT :candidates)
+            """)
+        
+        if not categories or 'health' in categories:
+            platform_years = cached_platform_years()
+            params['platform_year'] = year or (platform_years[-1] if platform_years else get_current_year())
+            conditions = ["hp.year = :platform_year"]
+            if sub_types:
+                conditions.append("hp.type = ANY(:sub_types)")
+            branches.append(f"""
+                (SELECT 'platform' AS source, hp.id, hp.name, 'health' AS category, hp.type AS sub_type,
+                        hp.year, hp.district, hp.location
+                 FROM health_platforms hp
+                 WHERE {' AND '.join(conditions)}
+                 ORDER BY hp.location <-> ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)
+                 LIMIT :candidates)
+            """)
+        
+        if sub_types:
+            params['sub_types'] = sub_types
+        
+        results = []
+        if branches:
+            query = db.text(f"""
+                SELECT source, id, name, category, sub_type, year, district,
+                       ST_X(location) AS longitude,
+                       ST_Y(location) AS latitude,
+                       ST_Distance(location::geography, ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography) AS distance_m
+                FROM ({' UNION ALL '.join(branches)}) candidates
+                ORDER BY distance_m
+                LIMIT :k
+            """)
+            results = [{
+                'source': row.source,
+                'id': row.id,
+                'name': row.name,
+                'category': row.category,
+                'sub_type': row.sub_type,
+                'year': row.year,
+                'district': row.district,
+                'longitude': row.longitude,
+                'latitude': row.latitude,
+                'distance_m': round(row.distance_m, 1)
+            } for row in db.session.execute(query, params)]
+        
+        return jsonify({
+            'origin': [lon, lat],
+            'k': k,
+            'results': results
+        })
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error finding nearest facilities: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+# Hex-bin density
+DENSITY_CELL_SIZES = (250, 500, 1000, 2000)  # Standard hexagon widths (metres), precomputed after uploads
+DENSITY_DEFAULT_CELL_SIZE = 1000
+DENSITY_MIN_CELL_SIZE = 100
+DENSITY_MAX_CELL_SIZE = 10000
+DENSITY_TABLES = ('health_platforms', 'facilities')
+DENSITY_TTL = int(os.getenv('DENSITY_TTL', 3600))
+density_cache = TTLCache(DENSITY_TTL)
+EARTH_RADIUS_M = 6371008.8
+
+def density_data_versions():
+    versions = DataVersion.get_versions(DENSITY_TABLES)
+    return tuple(versions[table] for table in DENSITY_TABLES)
+
+def density_projection():
+    """Origin and metres-per-degree factors of a local equirectangular projection
+    centred on HARARE_BOUNDS (distortion well under 1% across the city)"""
+    min_lon, min_lat, max_lon, max_lat = HARARE_BOUNDS
+    lon0, lat0 = (min_lon + max_lon) / 2, (min_lat + max_lat) / 2
+    ky = math.radians(1) * EARTH_RADIUS_M
+    return lon0, lat0, ky * math.cos(math.radians(lat0)), ky
+
+def hex_bin(lons, lats, cell_size):
+    """Axial (q, r) coordinates of the pointy-top hexagon, `cell_size` metres
+    across its flat sides, that contains each point"""
+    lon0, lat0, kx, ky = density_projection()
+    x = (np.asarray(lons, dtype=float) - lon0) * kx
+    y = (np.asarray(lats, dtype=float) - lat0) * ky
+    radius = cell_size / math.sqrt(3)
+    
+    q = (math.sqrt(3) / 3 * x - y / 3) / radius
+    r = (2 / 3 * y) / radius
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    # Cube rounding: recompute the coordinate with the largest rounding error
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq.astype(int), rr.astype(int)
+
+def hex_ring(q, r, cell_size):
+    """Closed lon/lat ring of hexagon (q, r)"""
+    lon0, lat0, kx, ky = density_projection()
+    radius = cell_size / math.sqrt(3)
+    cx = radius * math.sqrt(3) * (q + r / 2)
+    cy = radius * 1.5 * r
+    ring = []
+    for corner in range(7):
+        angle = math.radians(60 * (corner % 6) + 30)
+        ring.append([round(lon0 + (cx + radius * math.cos(angle)) / kx, 6),
+                     round(lat0 + (cy + radius * math.sin(angle)) / ky, 6)])
+    return ring
+
+def compute_density(year, category, cell_size):
+    """Hexagon FeatureCollection of point counts (plus youth/member sums when
+    health platforms are included) over the Harare extent"""
+    params = dict(zip(('min_lon', 'min_lat', 'max_lon', 'max_lat'), HARARE_BOUNDS), year=year)
+    in_extent = "location && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)"
+    include_platforms = category in (None, 'health')
+    columns = []  # (lons, lats, youth, members) per source
+    
+    if include_platforms:
+        rows = db.session.execute(db.text(f"""
+            SELECT ST_X(location) AS lon, ST_Y(location) AS lat,
+                   COALESCE(youth_count, 0) AS youth_count, COALESCE(total_members, 0) AS total_members
+            FROM health_platforms
+            WHERE year = :year AND {in_extent}
+        """), params).fetchall()
+        columns.append(([row.lon for row in rows], [row.lat for row in rows],
+                        [row.youth_count for row in rows], [row.total_members for row in rows]))
+    
+    if category != 'health' and schema_registry.has_table('facilities'):
+        if category:
+            params['category'] = category
+        rows = db.session.execute(db.text(f"""
+            SELECT ST_X(location) AS lon, ST_Y(location) AS lat
+            FROM facilities
+            WHERE year = :year AND {in_extent}
+            {'AND category = :category' if category else ''}
+        """), params).fetchall()
+        columns.append(([row.lon for row in rows], [row.lat for row in rows], [0] * len(rows), [0] * len(rows)))
+    
+    lons, lats, youth, members = (np.concatenate([np.asarray(c[i], dtype=float) for c in columns]) if columns
+                                  else np.empty(0) for i in range(4))
+    features = []
+    if len(lons):
+        q, r = hex_bin(lons, lats, cell_size)
+        cells, inverse = np.unique(np.column_stack((q, r)), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        counts = np.bincount(inverse, minlength=len(cells))
+        youth_sums = np.bincount(inverse, weights=youth, minlength=len(cells))
+        member_sums = np.bincount(inverse, weights=members, minlength=len(cells))
+        
+        for i, (cell_q, cell_r) in enumerate(cells.tolist()):
+            properties = {'q': cell_q, 'r': cell_r, 'count': int(counts[i])}
+            if include_platforms:
+                properties['youth_count'] = int(youth_sums[i])
+                properties['total_members'] = int(member_sums[i])
+            features.append({
+                'type': 'Feature',
+                'geometry': {'type': 'Polygon', 'coordinates': [hex_ring(cell_q, cell_r, cell_size)]},
+                'properties': properties
+            })
+    
+    return {
+        'type': 'FeatureCollection',
+        'year': year,
+        'category': category,
+        'cell_size': cell_size,
+        'point_count': int(len(lons)),
+        'features': features
+    }
+
+def cached_density(year, category, cell_size, versions):
+    return density_cache.get_or_compute(
+        ('density', year, category, cell_size, versions),
+        lambda: compute_density(year, category, cell_size)
+    )
+
+def evict_density(table, year=None):
+    """Drop cached hex bins a write to `table` may have changed"""
+    if table in DENSITY_TABLES:
+        if year is None:
+            density_cache.evict('density')
+        else:
+            density_cache.evict('density', year)
+
+def warm_density(year):
+    """Precompute the standard cell sizes for `year` on the shared warming thread"""
+    def run():
+        with app.app_context():
+            try:
+                versions = density_data_versions()
+                categories = [None, 'health']
+                if schema_registry.has_table('facilities'):
+                    categories += [row[0] for row in db.session.execute(db.text(
+                        "SELECT DISTINCT category FROM facilities WHERE year = :year AND category IS NOT NULL"
+                    ), {'year': year})]
+                for category in categories:
+                    for cell_size in DENSITY_CELL_SIZES:
+                        cached_density(year, category, cell_size, versions)
+                print(f"Warmed density grids for {len(categories)} categories ({year})")
+            except Exception as e:
+                print(f"Warning: Could not warm density grids for {year}: {e}")
+            finally:
+                db.session.remove()
+    
+    submit_warm(('density', year), run)
+
+
+@app.route('/api/density', methods=['GET'])
+@conditional_get(*DENSITY_TABLES)
+@compressed_cache
+def get_density():
+    """Hex-bin point density over the Harare extent
+    
+    ?cell_size= is the hexagon width in metres (default 1000; the standard sizes
+    250/500/1000/2000 are precomputed after each upload). ?category= limits to
+    one facility category ('health' for health platforms only; default both
+    tables). Health platform cells also carry youth_count/total_members sums.
+    """
+    category = request.args.get('category') or None
+    cell_size = request.args.get('cell_size', DENSITY_DEFAULT_CELL_SIZE, type=int)
+    if not DENSITY_MIN_CELL_SIZE <= cell_size <= DENSITY_MAX_CELL_SIZE:
+        return jsonify({"error": f"cell_size must be between {DENSITY_MIN_CELL_SIZE} and {DENSITY_MAX_CELL_SIZE}"}), 400
+    
+    year = request.args.get('year', type=int)
+    
+    try:
+        if not year:
+            years = cached_platform_years() if category == 'health' else cached_facility_years()
+            if not category:
+                years = list(years) + list(cached_platform_years())
+            year = max(years) if years else get_current_year()
+        
+        try:
+            versions = density_data_versions()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Warning: Could not read data versions: {e}")
+            return no_store(jsonify(compute_density(year, category, cell_size)))
+        
+        return jsonify(cached_density(year, category, cell_size, versions))
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error computing density: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+# Vector tiles
+TILE_CACHE_FOLDER = os.getenv('TILE_CACHE_FOLDER', 'tile_cache')
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+TILE_MAX_ZOOM = 22
+
+# Per-layer feature SQL for ST_AsMVT. `bounds.envelope` is the tile in EPSG:3857;
+# filtering on the 4326 column against the transformed envelope keeps the GIST index in play.
+TILE_LAYER_SQL = {
+    'boundaries': """
+        SELECT id, name, code, population,
+               ST_AsMVTGeom(ST_Transform({boundary_column}, 3857), bounds.envelope, {extent}, {buffer}, true) AS geom
+        FROM district_boundaries, bounds
+        WHERE boundary && ST_Transform(bounds.envelope, 4326)
+    """,
+    'health_platforms': """
+        SELECT id, name, type, youth_count, total_members, year, district,
+               ST_AsMVTGeom(ST_Transform(location, 3857), bounds.envelope, {extent}, {buffer}, true) AS geom
+        FROM health_platforms, bounds
+        WHERE location && ST_Transform(bounds.envelope, 4326)
+          AND (CAST(:year AS INTEGER) IS NULL OR year = :year)
+    """,
+    'facilities': """
+        SELECT id, name, category, sub_type, year, district,
+               ST_AsMVTGeom(ST_Transform(location, 3857), bounds.envelope, {extent}, {buffer}, true) AS geom
+        FROM facilities, bounds
+        WHERE location && ST_Transform(bounds.envelope, 4326)
+          AND (CAST(:year AS INTEGER) IS NULL OR year = :year)
+          AND (CAST(:category AS TEXT) IS NULL OR category = :category)
+    """
+}
+
+
+# Source table of each tile layer (its data version is part of the cache path)
+TILE_LAYER_TABLES = {layer: table for table, layer in TABLE_TILE_LAYERS.items()}
+
+
+def tile_cache_path(layer, version, year, category, z, x, y):
+    """On-disk cache location for a tile: <cache>/<layer>/v<version>/<year>/<category>/<z>/<x>/<y>.mvt"""
+    return os.path.join(TILE_CACHE_FOLDER, layer, f'v{version}', str(year or 'all'),
+                        secure_filename(category or '') or 'all', str(z), str(x), f'{y}.mvt')
+
+
+def prune_tile_cache(layer):
+    """Remove a layer's tiles from versions before the previous one.
+    
+    A write bumps the layer's data version, so new requests already miss the old
+    tiles; the previous version is kept because requests that read it just before
+    the bump may still be writing into it.
+    """
+    try:
+        current = DataVersion.get_versions([TILE_LAYER_TABLES[layer]])[TILE_LAYER_TABLES[layer]]
+    except Exception as e:
+        db.session.rollback()
+        print(f"Warning: Could not read data version for tile layer {layer}: {e}")
+        return
+    layer_folder = os.path.join(TILE_CACHE_FOLDER, layer)
+    try:
+        entries = os.listdir(layer_folder)
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.startswith('v') and entry[1:].isdigit() and int(entry[1:]) < current - 1:
+            shutil.rmtree(os.path.join(layer_folder, entry), ignore_errors=True)
+
+
+def cache_tile(cache_path, tile):
+    """Write a tile to the cache via a temp file so concurrent workers never read a partial tile"""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(tile)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        # Only the cache copy is lost (e.g. its version folder was pruned meanwhile)
+        print(f"Warning: Could not cache tile {cache_path}: {e}")
+
+
+def render_tile(layer, z, x, y, year=None, category=None):
+    """Render one Mapbox Vector Tile for a layer with PostGIS"""
+    layer_sql = TILE_LAYER_SQL[layer].format(
+        boundary_column=boundary_geometry_sql(zoom=z),
+        extent=TILE_EXTENT,
+        buffer=TILE_BUFFER
+    )
+    query = db.text(f"""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(:z, :x, :y) AS envelope
+        ),
+        features AS (
+            {layer_sql}
+        )
+        SELECT ST_AsMVT(features, :layer, {TILE_EXTENT}, 'geom') FROM features
+    """)
+    tile = db.session.execute(query, {
+        'z': z, 'x': x, 'y': y, 'layer': layer, 'year': year, 'category': category
+    }).scalar()
+    return bytes(tile) if tile else b''
+
+
+@app.route('/api/tiles/<layer>/<int:z>/<int:x>/<int:y>.mvt', methods=['GET'])
+def get_tile(layer, z, x, y):
+    """Serve a vector tile for boundaries, health_platforms or facilities (?year=&category=)"""
+    if layer not in TILE_LAYER_SQL:
+        return jsonify({"error": f"Unknown tile layer '{layer}'. Use one of: {', '.join(TILE_LAYER_SQL)}"}), 404
+    if z < 0 or z > TILE_MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        return jsonify({"error": "Tile coordinates out of range"}), 400
+    
+    year = request.args.get('year', type=int) if layer != 'boundaries' else None
+    category = (request.args.get('category') or None) if layer == 'facilities' else None
+    
+    try:
+        # Read the version before rendering: a tile rendered from older data can then
+        # only land under an older version's path, never under the current one
+        try:
+            version = table_version(TILE_LAYER_TABLES[layer])
+        except Exception as e:
+            db.session.rollback()
+            print(f"Warning: Could not read data version for tile layer {layer}: {e}")
+            version = None
+        
+        cache_path = tile_cache_path(layer, version, year, category, z, x, y) if version is not None else None
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, 'rb') as f:
+                tile = f.read()
+        else:
+            tile = render_tile(layer, z, x, y, year, category)
+            if cache_path:
+                cache_tile(cache_path, tile)
+        
+        return app.response_class(tile, mimetype='application/vnd.mapbox-vector-tile')
+    except Exception as e:
+        print(f"Error rendering tile {layer}/{z}/{x}/{y}: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+# Offline tile archives (one PMTiles file per published year)
+TILE_ARCHIVE_FOLDER = os.getenv('TILE_ARCHIVE_FOLDER', 'tile_archives')
+TILE_ARCHIVE_LAYERS = ['boundaries', 'health_platforms', 'facilities']
+
+# Harare extent used when pre-rendering archives (min_lon, min_lat, max_lon, max_lat)
+HARARE_BOUNDS = (30.85, -18.05, 31.25, -17.65)
+
+# Open archives per worker: path -> TileArchive, guarded by _tile_archive_lock
+_tile_archives = {}
+_tile_archive_lock = threading.Lock()
+
+
+def tile_archive_path(year):
+    return os.path.join(TILE_ARCHIVE_FOLDER, f'harare_{year}.pmtiles')
+
+
+def tiles_covering(bounds, z):
+    """Yield (x, y) for every XYZ tile at zoom z intersecting lon/lat bounds"""
+    min_lon, min_lat, max_lon, max_lat = bounds
+    
+    def lon_to_x(lon):
+        return int((lon + 180.0) / 360.0 * 2 ** z)
+    
+    def lat_to_y(lat):
+        lat_rad = math.radians(lat)
+        return int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * 2 ** z)
+    
+    last = 2 ** z - 1
+    for x in range(max(lon_to_x(min_lon), 0), min(lon_to_x(max_lon), last) + 1):
+        for y in range(max(lat_to_y(max_lat), 0), min(lat_to_y(min_lat), last) + 1):
+            yield x, y
+
+
+def build_tile_archive(year, min_zoom, max_zoom, bounds=HARARE_BOUNDS):
+    """Pre-render all layers for a year into a PMTiles archive; returns (path, tiles written)"""
+    tiles = sorted(
+        (zxy_to_tileid(z, x, y), z, x, y)
+        for z in range(min_zoom, max_zoom + 1)
+        for x, y in tiles_covering(bounds, z)
+    )
+    
+    os.makedirs(TILE_ARCHIVE_FOLDER, exist_ok=True)
+    path = tile_archive_path(year)
+    fd, temp_path = tempfile.mkstemp(dir=TILE_ARCHIVE_FOLDER, suffix='.tmp')
+    tiles_written = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            writer = PMTilesWriter(f)
+            for tile_id, z, x, y in tiles:
+                # An MVT tile is a sequence of layers, so per-layer tiles concatenate
+                tile = b''.join(render_tile(layer, z, x, y, year) for layer in TILE_ARCHIVE_LAYERS)
+                if tile:
+                    writer.write_tile(tile_id, gzip.compress(tile))
+                    tiles_written += 1
+            
+            if tiles_written:
+                min_lon, min_lat, max_lon, max_lat = bounds
+                writer.finalize({
+                    'tile_type': TileType.MVT,
+                    'tile_compression': Compression.GZIP,
+                    'min_lon_e7': int(min_lon * 10000000),
+                    'min_lat_e7': int(min_lat * 10000000),
+                    'max_lon_e7': int(max_lon * 10000000),
+                    'max_lat_e7': int(max_lat * 10000000),
+                    'center_zoom': min_zoom,
+                    'center_lon_e7': int((min_lon + max_lon) / 2 * 10000000),
+                    'center_lat_e7': int((min_lat + max_lat) / 2 * 10000000)
+                }, {
+                    'name': f'SRHR Dashboard {year}',
+                    'year': year,
+                    'vector_layers': [{'id': layer} for layer in TILE_ARCHIVE_LAYERS]
+                })
+        
+        if tiles_written:
+            os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    
+    return path, tiles_written
+
+
+class TileArchive:
+    """An open PMTiles archive file shared by request threads.
+    
+    Readers are counted; when the file is rebuilt the archive is retired and its
+    descriptor is closed by the last in-flight read, never under a running pread.
+    """
+    
+    def __init__(self, path, signature):
+        self.signature = signature
+        self.fd = os.open(path, os.O_RDONLY)
+        self.users = 0
+        self.retired = False
+        # Byte-range reads straight from the file; pread is safe across threads
+        self.reader = PMTilesReader(lambda offset, length: os.pread(self.fd, length, offset))
+    
+    def release(self):
+        with _tile_archive_lock:
+            self.users -= 1
+            close = self.retired and self.users == 0
+        if close:
+            os.close(self.fd)
+
+
+def acquire_tile_archive(year):
+    """Open archive for a year (reopened when the file is rebuilt), or None.
+    
+    The caller must call release() on the result when done reading.
+    """
+    path = tile_archive_path(year)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    with _tile_archive_lock:
+        archive = _tile_archives.get(path)
+        if archive is None or archive.signature != signature:
+            try:
+                opened = TileArchive(path, signature)
+            except FileNotFoundError:
+                return None
+            if archive is not None:
+                archive.retired = True
+                if archive.users == 0:
+                    os.close(archive.fd)
+            archive = _tile_archives[path] = opened
+        archive.users += 1
+        return archive
+
+
+@app.route('/api/tiles/archive/<int:year>/<int:z>/<int:x>/<int:y>.mvt', methods=['GET'])
+def get_archive_tile(year, z, x, y):
+    """Serve a multi-layer vector tile from a year's pre-built PMTiles archive"""
+    archive = acquire_tile_archive(year)
+    if archive is None:
+        return jsonify({"error": f"No tile archive for {year}. Run: flask --app app_db build-tile-archive --year {year}"}), 404
+    
+    try:
+        tile = archive.reader.get(z, x, y)
+    finally:
+        archive.release()
+    if not tile:
+        return app.response_class(status=204)
+    
+    response = app.response_class(tile, mimetype='application/vnd.mapbox-vector-tile')
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
 # Database initialization commands
 @app.cli.command('init-db')
 def init_db():
     """Initialize the database"""
     db.create_all()
+    schema_registry.refresh()
     print("Database initialized successfully!")
 
 
+@app.cli.command('build-tile-archive')
+@click.option('--year', 'years', type=int, multiple=True, help='Year to publish (repeatable; default: all years with data)')
+@click.option('--min-zoom', type=int, default=8, show_default=True)
+@click.option('--max-zoom', type=int, default=15, show_default=True)
+def build_tile_archive_command(years, min_zoom, max_zoom):
+    """Pre-render boundary, platform and facility tiles for the Harare extent into PMTiles archives
+    
+    Archives are a snapshot: rebuild a year after changing its data.
+    """
+    if not years:
+        years = HealthPlatform.get_available_years()
+        if schema_registry.has_table('facilities'):
+            facility_years = db.session.execute(db.text("SELECT DISTINCT year FROM facilities")).scalars().all()
+            years = sorted(set(years) | set(facility_years))
+    
+    for year in years:
+        path, tiles_written = build_tile_archive(year, min_zoom, max_zoom)
+        if tiles_written:
+            print(f"✅ {year}: wrote {tiles_written} tiles (zoom {min_zoom}-{max_zoom}) to {path}")
+        else:
+            print(f"Skipped {year}: no features in the Harare extent")
+
+
+@app.cli.command('fail-stale-upload-jobs')
+def fail_stale_upload_jobs_command():
+    """Mark upload jobs lost with their worker (no update for UPLOAD_JOB_STALE_SECONDS) as failed"""
+    fail_interrupted_upload_jobs()
+
+
 @app.cli.command('seed-db')
 def seed_db():
     """Seed the database with sample data"""
@@ -2477,9 +4688,7 @@ if __name__ == '__main__':
         
         # Auto-create facilities table if it doesn't exist
         try:
-            from sqlalchemy import inspect
-            inspector = inspect(db.engine)
-            if 'facilities' not in inspector.get_table_names():
+            if not schema_registry.has_table('facilities'):
                 print("Creating facilities table...")
                 # Execute schema
                 schema_path = os.path.join('database', 'schema_facilities.sql')
@@ -2495,10 +4704,13 @@ if __name__ == '__main__':
                                     print(f"Note: {e}")
                         db.session.commit()
                     print("✅ Facilities table created!")
+                    schema_registry.refresh()
         except Exception as e:
             print(f"Note: Could not auto-create facilities table: {e}")
             print("You can create it manually later.")
     
+    fail_interrupted_upload_jobs()
+    
     port = int(os.getenv('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=os.getenv('FLASK_ENV') == 'development')
 
@@ -0,0 +1,58 @@
+"""
+Compare /api/boundaries output formats on the boundaries currently in the database
+Reports raw and gzip-compressed response size plus latency for full-precision GeoJSON,
+reduced-precision GeoJSON and quantized TopoJSON.
+
+Usage:
+    python benchmark-boundary-formats.py
+    python benchmark-boundary-formats.py --repeat 10
+"""
+
+import argparse
+import gzip
+import json
+import time
+
+from app_db import app
+
+VARIANTS = [
+    ('GeoJSON (full precision)', ''),
+    ('GeoJSON precision=6', 'precision=6'),
+    ('GeoJSON precision=5', 'precision=5'),
+    ('TopoJSON q=1e5', 'format=topojson'),
+    ('TopoJSON q=1e4', 'format=topojson&quantization=10000'),
+]
+
+
+def run(repeat):
+    client = app.test_client()
+
+    baseline = client.get('/api/boundaries').get_json()
+    if not baseline:
+        raise SystemExit("No boundaries in the database - upload a boundary file first")
+    print(f"{len(baseline)} boundaries\n")
+
+    print(f"{'variant':<26} | {'bytes':>11} | {'gzip bytes':>11} | {'vs full':>7} | {'median s':>8}")
+    print("-" * 76)
+
+    full_size = None
+    for label, query in VARIANTS:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = client.get(f'/api/boundaries?{query}')
+            body = response.get_data()
+            timings.append(time.perf_counter() - started)
+        json.loads(body)  # make sure every variant is valid JSON
+
+        full_size = full_size or len(body)
+        timings.sort()
+        print(f"{label:<26} | {len(body):>11} | {len(gzip.compress(body)):>11} | "
+              f"{len(body) / full_size:>6.0%} | {timings[len(timings) // 2]:>8.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Requests per variant (median latency is reported)')
+    args = parser.parse_args()
+    run(args.repeat)
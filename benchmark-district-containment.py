@@ -0,0 +1,124 @@
+"""
+Benchmark district point-in-polygon lookups: full boundaries vs subdivided pieces
+Uses the boundaries currently in the database (e.g. the Harare suburbs) and random
+points over their extent in a temporary table, so nothing persistent is written.
+Reports vertex counts, lookup time for the per-point district assignment query on
+both paths, and checks that the two paths agree.
+
+Usage:
+    python benchmark-district-containment.py
+    python benchmark-district-containment.py --points 50000 --max-vertices 32 --repeat 5
+"""
+
+import argparse
+import time
+
+from app_db import app
+from database.models import db
+
+FULL_BOUNDARY_SQL = """
+    SELECT p.id, (
+        SELECT b.id FROM district_boundaries b
+        WHERE ST_Covers(b.boundary, p.geom)
+        ORDER BY b.id
+        LIMIT 1
+    ) AS district_id
+    FROM bench_points p
+"""
+
+PIECES_SQL = """
+    SELECT p.id, (
+        SELECT pc.boundary_id FROM bench_pieces pc
+        WHERE ST_Covers(pc.geom, p.geom)
+        ORDER BY pc.boundary_id
+        LIMIT 1
+    ) AS district_id
+    FROM bench_points p
+"""
+
+
+def setup(points, max_vertices):
+    """Random points over the boundary extent and freshly subdivided pieces, as temp tables"""
+    db.session.execute(db.text("""
+        CREATE TEMP TABLE bench_points ON COMMIT PRESERVE ROWS AS
+        WITH extent AS (SELECT ST_Extent(boundary) AS box FROM district_boundaries)
+        SELECT n AS id,
+               ST_SetSRID(ST_MakePoint(
+                   ST_XMin(box) + random() * (ST_XMax(box) - ST_XMin(box)),
+                   ST_YMin(box) + random() * (ST_YMax(box) - ST_YMin(box))
+               ), 4326) AS geom
+        FROM extent, generate_series(1, :points) AS n
+    """), {'points': points})
+    db.session.execute(db.text("CREATE INDEX ON bench_points USING GIST (geom)"))
+
+    db.session.execute(db.text("""
+        CREATE TEMP TABLE bench_pieces ON COMMIT PRESERVE ROWS AS
+        SELECT b.id AS boundary_id, ST_Subdivide(b.boundary, :max_vertices) AS geom
+        FROM district_boundaries b
+    """), {'max_vertices': max_vertices})
+    db.session.execute(db.text("CREATE INDEX ON bench_pieces USING GIST (geom)"))
+    db.session.execute(db.text("ANALYZE bench_points"))
+    db.session.execute(db.text("ANALYZE bench_pieces"))
+
+
+def vertex_stats(table, column):
+    row = db.session.execute(db.text(f"""
+        SELECT COUNT(*) AS n, AVG(ST_NPoints({column})) AS avg_vertices, MAX(ST_NPoints({column})) AS max_vertices
+        FROM {table}
+    """)).fetchone()
+    return row.n, float(row.avg_vertices or 0), int(row.max_vertices or 0)
+
+
+def timed(sql, repeat):
+    """Median seconds over `repeat` runs, plus the last result as {point id: district id}"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = dict(db.session.execute(db.text(sql)).fetchall())
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2], result
+
+
+def run(points, max_vertices, repeat):
+    with app.app_context():
+        boundaries = db.session.execute(db.text("SELECT COUNT(*) FROM district_boundaries")).scalar()
+        if not boundaries:
+            raise SystemExit("No boundaries in the database - upload a boundary file first")
+
+        setup(points, max_vertices)
+        try:
+            n, avg_full, max_full = vertex_stats('district_boundaries', 'boundary')
+            pieces, avg_piece, max_piece = vertex_stats('bench_pieces', 'geom')
+            print(f"{n} boundaries: {avg_full:.0f} vertices on average (max {max_full})")
+            print(f"{pieces} pieces at --max-vertices {max_vertices}: "
+                  f"{avg_piece:.0f} vertices on average (max {max_piece})\n")
+
+            full_seconds, full_result = timed(FULL_BOUNDARY_SQL, repeat)
+            piece_seconds, piece_result = timed(PIECES_SQL, repeat)
+
+            inside = sum(1 for district_id in full_result.values() if district_id is not None)
+            differing = sum(1 for point_id, district_id in full_result.items()
+                            if piece_result.get(point_id) != district_id)
+
+            print(f"{'path':<22} | {'median s':>9} | {'points/s':>10}")
+            print("-" * 48)
+            print(f"{'full boundaries':<22} | {full_seconds:>9.3f} | {points / full_seconds:>10.0f}")
+            print(f"{'subdivided pieces':<22} | {piece_seconds:>9.3f} | {points / piece_seconds:>10.0f}")
+            print(f"\n{inside} of {points} points fall inside a district; "
+                  f"{differing} assignments differ (points exactly on a boundary edge)")
+            print(f"Speed-up: {full_seconds / piece_seconds:.1f}x")
+        finally:
+            db.session.rollback()
+            db.session.execute(db.text("DROP TABLE IF EXISTS bench_points, bench_pieces"))
+            db.session.commit()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=20000)
+    parser.add_argument('--max-vertices', type=int, default=64, help='ST_Subdivide vertex limit per piece')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per path (median is reported)')
+    args = parser.parse_args()
+    run(args.points, args.max_vertices, args.repeat)
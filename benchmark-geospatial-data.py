@@ -0,0 +1,118 @@
+"""
+Benchmark /api/geospatial-data: per-row ORM serialization vs single-query FeatureCollection
+Seeds synthetic health platforms into a scratch year, measures query count and latency,
+then removes the seeded rows again.
+
+Usage:
+    python benchmark-geospatial-data.py                 # 1k, 10k, 100k rows
+    python benchmark-geospatial-data.py --sizes 1000 5000 --legacy-limit 10000
+"""
+
+import argparse
+import json
+import time
+
+from sqlalchemy import event
+
+from app_db import app, data_changed
+from database.models import db, HealthPlatform
+from geo_formats import dumps_bytes
+
+
+def seed_platforms(year, count):
+    """Insert `count` synthetic platforms around Harare for `year` in one statement"""
+    db.session.execute(db.text("""
+        INSERT INTO health_platforms (name, type, youth_count, total_members, year, district, location)
+        SELECT
+            'Benchmark Committee ' || n,
+            'Health Committee',
+            (n % 20),
+            20 + (n % 30),
+            :year,
+            'Benchmark',
+            ST_SetSRID(ST_MakePoint(30.9 + random() * 0.3, -17.95 + random() * 0.2), 4326)
+        FROM generate_series(1, :count) AS n
+    """), {'year': year, 'count': count})
+    db.session.commit()
+    # Raw SQL bypasses the API: bump the version so ETags and cached responses move on
+    data_changed('health_platforms', year)
+
+
+def clear_platforms(year):
+    db.session.execute(db.text("DELETE FROM health_platforms WHERE year = :year"), {'year': year})
+    db.session.commit()
+    data_changed('health_platforms', year)
+
+
+class QueryCounter:
+    """Counts statements sent to the database while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def legacy_geospatial_data(year):
+    """The previous implementation: ORM load + one ST_AsGeoJSON query per platform"""
+    platforms = HealthPlatform.query.filter_by(year=year).all()
+    features = [platform.to_geojson_feature() for platform in platforms]
+    return dumps_bytes({"type": "FeatureCollection", "features": features})
+
+
+def run(sizes, year, legacy_limit):
+    client = app.test_client()
+
+    with app.app_context():
+        existing = db.session.execute(
+            db.text("SELECT COUNT(*) FROM health_platforms WHERE year = :year"), {'year': year}
+        ).scalar()
+        if existing:
+            raise SystemExit(f"Year {year} already has {existing} platforms - pick an unused --year")
+
+        print(f"{'rows':>8} | {'path':<12} | {'queries':>8} | {'seconds':>8} | {'bytes':>12}")
+        print("-" * 60)
+
+        for size in sizes:
+            seed_platforms(year, size)
+            try:
+                if size <= legacy_limit:
+                    db.session.expire_all()
+                    with QueryCounter(db.engine) as counter:
+                        started = time.perf_counter()
+                        body = legacy_geospatial_data(year)
+                        elapsed = time.perf_counter() - started
+                    print(f"{size:>8} | {'per-row ORM':<12} | {counter.count:>8} | {elapsed:>8.3f} | {len(body):>12}")
+                else:
+                    print(f"{size:>8} | {'per-row ORM':<12} | {'skipped (above --legacy-limit)':>33}")
+
+                with QueryCounter(db.engine) as counter:
+                    started = time.perf_counter()
+                    response = client.get(f'/api/geospatial-data?year={year}')
+                    body = response.get_data()
+                    elapsed = time.perf_counter() - started
+                assert response.status_code == 200, response.get_data(as_text=True)
+                assert len(json.loads(body)['features']) == size
+                print(f"{size:>8} | {'single query':<12} | {counter.count:>8} | {elapsed:>8.3f} | {len(body):>12}")
+            finally:
+                clear_platforms(year)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--year', type=int, default=2099, help='Scratch year used for seeded rows (must be empty)')
+    parser.add_argument('--legacy-limit', type=int, default=100000,
+                        help='Skip the per-row ORM path above this many rows')
+    args = parser.parse_args()
+    run(args.sizes, args.year, args.legacy_limit)
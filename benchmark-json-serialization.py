@@ -0,0 +1,94 @@
+"""
+Micro-benchmark: CPU spent serializing boundary responses
+Compares the previous path (json.loads of ST_AsGeoJSON text, then Flask's default
+JSON provider) against embedding the text verbatim with geo_formats.raw_json and
+the orjson provider. Uses synthetic boundaries, so no database is needed.
+
+Usage:
+    python benchmark-json-serialization.py
+    python benchmark-json-serialization.py --boundaries 1000 --vertices 400 --repeat 20
+"""
+
+import argparse
+import json
+import math
+import random
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from geo_formats import OrjsonProvider, raw_json
+
+
+def synthetic_geojson(vertices, rng):
+    """ST_AsGeoJSON-style text for a roughly circular suburb polygon around Harare"""
+    cx, cy = 30.9 + rng.random() * 0.3, -17.95 + rng.random() * 0.2
+    ring = []
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        radius = 0.01 * (0.8 + rng.random() * 0.4)
+        ring.append([round(cx + radius * math.cos(angle), 9), round(cy + radius * math.sin(angle), 9)])
+    ring.append(ring[0])
+    return json.dumps({"type": "MultiPolygon", "coordinates": [[ring]]}, separators=(',', ':'))
+
+
+def boundary_rows(count, vertices):
+    rng = random.Random(42)
+    return [
+        {'id': i, 'name': f'Suburb {i}', 'code': f'S{i:04d}', 'population': 1000 + i,
+         'area_km2': 2.5, 'boundary_geojson': synthetic_geojson(vertices, rng)}
+        for i in range(count)
+    ]
+
+
+def build_response(rows, load_geometry):
+    """Mirrors the boundaries_list construction in get_boundaries"""
+    return [
+        {'id': row['id'], 'name': row['name'], 'code': row['code'], 'population': row['population'],
+         'area_km2': row['area_km2'], 'boundary': load_geometry(row['boundary_geojson'])}
+        for row in rows
+    ]
+
+
+def cpu_seconds(fn, repeat):
+    """Median process CPU time of `repeat` calls"""
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        fn()
+        timings.append(time.process_time() - started)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def run(boundaries, vertices, repeat):
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    orjson_provider = OrjsonProvider(app)
+    rows = boundary_rows(boundaries, vertices)
+
+    legacy_body = default_provider.dumps(build_response(rows, json.loads))
+    fast_body = orjson_provider.dumps(build_response(rows, raw_json))
+    assert json.loads(legacy_body) == json.loads(fast_body), "serializers disagree"
+
+    legacy = cpu_seconds(lambda: default_provider.dumps(build_response(rows, json.loads)), repeat)
+    fast = cpu_seconds(lambda: orjson_provider.dumps(build_response(rows, raw_json)), repeat)
+
+    per_1k = 1000 / boundaries
+    print(f"{boundaries} boundaries x {vertices} vertices, {len(fast_body)} bytes\n")
+    print(f"{'path':<34} | {'CPU ms / 1k boundaries':>22}")
+    print("-" * 60)
+    print(f"{'json.loads + Flask default':<34} | {legacy * per_1k * 1000:>22.1f}")
+    print(f"{'raw_json + orjson':<34} | {fast * per_1k * 1000:>22.1f}")
+    print(f"\nCPU saved per 1k boundaries: {(legacy - fast) * per_1k * 1000:.1f} ms "
+          f"({legacy / fast if fast else float('inf'):.1f}x faster)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--boundaries', type=int, default=1000)
+    parser.add_argument('--vertices', type=int, default=200, help='Vertices per boundary ring')
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per path (median CPU time is reported)')
+    args = parser.parse_args()
+    run(args.boundaries, args.vertices, args.repeat)
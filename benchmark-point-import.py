@@ -0,0 +1,112 @@
+"""
+Benchmark point uploads: per-feature ORM inserts vs the batched set-based loader
+Builds a synthetic FeatureCollection of health platforms around Harare, imports it into
+a scratch year with each path and reports rows/second, then removes the imported rows.
+
+Usage:
+    python benchmark-point-import.py                       # 1k and 10k features
+    python benchmark-point-import.py --sizes 50000 --batch-sizes 1000 5000 20000 --legacy-limit 10000
+"""
+
+import argparse
+import random
+import time
+
+from geoalchemy2.functions import ST_GeomFromText
+
+from app_db import app, import_geojson_to_db, point_rollup_cells, update_district_rollups, data_changed
+from database.models import db, HealthPlatform
+
+
+def synthetic_features(count, year):
+    rng = random.Random(42)
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point",
+                             "coordinates": [30.9 + rng.random() * 0.3, -17.95 + rng.random() * 0.2]},
+                "properties": {"name": f"Benchmark Committee {n}", "type": "Health Committee",
+                               "youth_count": n % 20, "total_members": 20 + n % 30, "year": year}
+            }
+            for n in range(count)
+        ]
+    }
+
+
+def clear_platforms(year):
+    """Delete the scratch year's platforms, keeping district rollups and data versions in step"""
+    cells = point_rollup_cells('health_platforms', 't.year = :year', {'year': year})
+    db.session.execute(db.text("DELETE FROM health_platforms WHERE year = :year"), {'year': year})
+    update_district_rollups('health_platforms', cells)
+    db.session.commit()
+    data_changed('health_platforms', year)
+
+
+def legacy_import(geojson_data, year):
+    """The previous loader: one ORM object (one INSERT) per feature"""
+    for feature in geojson_data['features']:
+        props = feature['properties']
+        lon, lat = feature['geometry']['coordinates']
+        db.session.add(HealthPlatform(
+            name=props['name'],
+            type=props['type'],
+            youth_count=int(props['youth_count']),
+            total_members=int(props['total_members']),
+            year=year,
+            location=ST_GeomFromText(f'POINT({lon} {lat})', 4326)
+        ))
+    db.session.commit()
+    return len(geojson_data['features'])
+
+
+def timed(load):
+    started = time.perf_counter()
+    rows = load()
+    return rows, time.perf_counter() - started
+
+
+def run(sizes, batch_sizes, year, legacy_limit):
+    with app.app_context():
+        existing = db.session.execute(
+            db.text("SELECT COUNT(*) FROM health_platforms WHERE year = :year"), {'year': year}
+        ).scalar()
+        if existing:
+            raise SystemExit(f"Year {year} already has {existing} platforms - pick an unused --year")
+
+        print(f"{'rows':>8} | {'path':<22} | {'seconds':>8} | {'rows/s':>10}")
+        print("-" * 58)
+
+        for size in sizes:
+            geojson_data = synthetic_features(size, year)
+
+            if size <= legacy_limit:
+                try:
+                    rows, elapsed = timed(lambda: legacy_import(geojson_data, year))
+                    print(f"{size:>8} | {'per-feature ORM':<22} | {elapsed:>8.3f} | {rows / elapsed:>10.0f}")
+                finally:
+                    clear_platforms(year)
+            else:
+                print(f"{size:>8} | {'per-feature ORM':<22} | {'skipped (above --legacy-limit)':>21}")
+
+            for batch_size in batch_sizes:
+                try:
+                    (rows, _), elapsed = timed(
+                        lambda: import_geojson_to_db(geojson_data, year, 'health', batch_size=batch_size))
+                    assert rows == size
+                    label = f'batched ({batch_size})'
+                    print(f"{size:>8} | {label:<22} | {elapsed:>8.3f} | {rows / elapsed:>10.0f}")
+                finally:
+                    clear_platforms(year)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--year', type=int, default=2099, help='Scratch year used for imported rows (must be empty)')
+    parser.add_argument('--legacy-limit', type=int, default=10000,
+                        help='Skip the per-feature ORM path above this many rows')
+    args = parser.parse_args()
+    run(args.sizes, args.batch_sizes, args.year, args.legacy_limit)
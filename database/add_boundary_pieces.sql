@@ -0,0 +1,25 @@
+-- Migration: Subdivided district boundary pieces for point-in-polygon tests
+-- Each boundary is split with ST_Subdivide into polygons of at most 64 vertices
+-- (BOUNDARY_PIECE_MAX_VERTICES in app_db.py), so containment tests against the
+-- GIST index pass few candidates and each exact test is cheap. import_boundaries_to_db
+-- rebuilds the pieces of every boundary it writes.
+-- Safe to run on existing databases; POST /api/admin/init-tables performs the same steps.
+
+CREATE TABLE IF NOT EXISTS district_boundary_pieces (
+    id SERIAL PRIMARY KEY,
+    boundary_id INTEGER NOT NULL REFERENCES district_boundaries(id) ON DELETE CASCADE,
+    geom GEOMETRY(Polygon, 4326) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_district_boundary_pieces_boundary_id ON district_boundary_pieces (boundary_id);
+CREATE INDEX IF NOT EXISTS idx_district_boundary_pieces_geom ON district_boundary_pieces USING GIST (geom);
+
+-- Build pieces for boundaries that have none yet
+INSERT INTO district_boundary_pieces (boundary_id, geom)
+SELECT b.id, ST_Subdivide(b.boundary, 64)
+FROM district_boundaries b
+WHERE NOT EXISTS (SELECT 1 FROM district_boundary_pieces pc WHERE pc.boundary_id = b.id);
+
+ANALYZE district_boundary_pieces;
+
+COMMENT ON TABLE district_boundary_pieces IS 'ST_Subdivide pieces of district_boundaries, maintained by the API on boundary import';
@@ -0,0 +1,21 @@
+-- Migration: Add precomputed simplified geometry tiers to district_boundaries
+-- Low-zoom map views request /api/boundaries?zoom=<z> and receive one of these
+-- instead of the full-resolution boundary. Safe to run on existing databases;
+-- POST /api/admin/init-tables performs the same steps.
+
+-- Add tier columns (tolerances must match BOUNDARY_SIMPLIFICATION_TIERS in app_db.py)
+ALTER TABLE district_boundaries
+ADD COLUMN IF NOT EXISTS boundary_simplified_z8 GEOMETRY(MultiPolygon, 4326),
+ADD COLUMN IF NOT EXISTS boundary_simplified_z11 GEOMETRY(MultiPolygon, 4326),
+ADD COLUMN IF NOT EXISTS boundary_simplified_z14 GEOMETRY(MultiPolygon, 4326);
+
+-- Populate tiers from the full-resolution boundary
+UPDATE district_boundaries SET
+    boundary_simplified_z8 = ST_Multi(ST_SimplifyPreserveTopology(boundary, 0.005)),
+    boundary_simplified_z11 = ST_Multi(ST_SimplifyPreserveTopology(boundary, 0.0005)),
+    boundary_simplified_z14 = ST_Multi(ST_SimplifyPreserveTopology(boundary, 0.00005));
+
+-- Add comments
+COMMENT ON COLUMN district_boundaries.boundary_simplified_z8 IS 'Boundary simplified at 0.005 degrees, served for zoom <= 8';
+COMMENT ON COLUMN district_boundaries.boundary_simplified_z11 IS 'Boundary simplified at 0.0005 degrees, served for zoom 9-11';
+COMMENT ON COLUMN district_boundaries.boundary_simplified_z14 IS 'Boundary simplified at 0.00005 degrees, served for zoom 12-14';
@@ -0,0 +1,16 @@
+-- Migration: Per-table data version counters
+-- The API bumps a table's version after every write (uploads, manage_* endpoints,
+-- refresh-trends, bulk deletes) and derives ETags from it, so unchanged dashboards
+-- revalidate with a 304 instead of re-running the heavy queries.
+-- Safe to run on existing databases; POST /api/admin/init-tables creates the same table.
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    table_name VARCHAR(100) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE data_versions IS 'Write counters per table; bumped by the API, used for ETags and response caches';
+
+-- Writes made outside the API (psql, seed scripts) should bump the version too, e.g.:
+-- UPDATE data_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'facilities';
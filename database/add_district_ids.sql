@@ -0,0 +1,36 @@
+-- Migration: Persisted district assignment for health platforms and facilities
+-- district_id is the district_boundaries row whose polygon covers the point (edges included). The API
+-- fills it with a spatial join when points are imported or moved and when boundaries
+-- are (re)imported, so district lookups are indexed equality filters instead of
+-- ST_Contains on every request.
+-- Safe to run on existing databases; POST /api/admin/init-tables performs the same steps.
+
+ALTER TABLE health_platforms
+    ADD COLUMN IF NOT EXISTS district_id INTEGER REFERENCES district_boundaries(id) ON DELETE SET NULL;
+ALTER TABLE facilities
+    ADD COLUMN IF NOT EXISTS district_id INTEGER REFERENCES district_boundaries(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_health_platforms_year_district_id ON health_platforms(year, district_id);
+CREATE INDEX IF NOT EXISTS idx_facilities_year_district_id ON facilities(year, district_id);
+
+-- Backfill (points outside every boundary stay NULL)
+UPDATE health_platforms t
+SET district_id = (
+    SELECT b.id FROM district_boundaries b
+    WHERE ST_Covers(b.boundary, t.location)
+    ORDER BY b.id
+    LIMIT 1
+)
+WHERE t.district_id IS NULL;
+
+UPDATE facilities t
+SET district_id = (
+    SELECT b.id FROM district_boundaries b
+    WHERE ST_Covers(b.boundary, t.location)
+    ORDER BY b.id
+    LIMIT 1
+)
+WHERE t.district_id IS NULL;
+
+COMMENT ON COLUMN health_platforms.district_id IS 'Containing district boundary, maintained by the API on write';
+COMMENT ON COLUMN facilities.district_id IS 'Containing district boundary, maintained by the API on write';
@@ -0,0 +1,37 @@
+-- Migration: Per-district, per-year category rollups
+-- One row per (district, year, source table, category, sub_type) with the point count,
+-- plus youth/total member sums for health platforms. Each API write recomputes the
+-- (district, year) cells it touched inside its own transaction, and
+-- /api/district/<name>/facilities reads its statistics block from here with one indexed query.
+-- Requires database/add_district_ids.sql.
+-- Safe to run on existing databases; POST /api/admin/init-tables performs the same steps.
+
+CREATE TABLE IF NOT EXISTS district_rollups (
+    district_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    source VARCHAR(30) NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    sub_type VARCHAR(100) NOT NULL DEFAULT '',
+    item_count INTEGER NOT NULL DEFAULT 0,
+    youth_count BIGINT NOT NULL DEFAULT 0,
+    total_members BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (district_id, year, source, category, sub_type)
+);
+
+COMMENT ON TABLE district_rollups IS 'Point counts per district/year/category, maintained by the API within each write';
+
+-- Initial fill
+DELETE FROM district_rollups;
+
+INSERT INTO district_rollups (district_id, year, source, category, sub_type, item_count, youth_count, total_members)
+SELECT district_id, year, 'health_platforms', type, '', COUNT(*),
+       COALESCE(SUM(youth_count), 0), COALESCE(SUM(total_members), 0)
+FROM health_platforms
+WHERE district_id IS NOT NULL
+GROUP BY district_id, year, type;
+
+INSERT INTO district_rollups (district_id, year, source, category, sub_type, item_count, youth_count, total_members)
+SELECT district_id, year, 'facilities', category, COALESCE(sub_type, ''), COUNT(*), 0, 0
+FROM facilities
+WHERE district_id IS NOT NULL
+GROUP BY district_id, year, category, COALESCE(sub_type, '');
@@ -0,0 +1,13 @@
+-- Migration: Indexes for filtered, keyset-paginated facility and platform listings
+-- Supports /api/facilities and /api/geospatial-data with ?after_id=&limit=,
+-- ?category=, ?district= (bbox filters use the existing GIST location indexes).
+-- Safe to run on existing databases; POST /api/admin/init-tables creates the same indexes.
+
+-- Keyset pages within a year (WHERE year = ? AND id > ? ORDER BY id LIMIT ?)
+CREATE INDEX IF NOT EXISTS idx_facilities_year_id ON facilities(year, id);
+CREATE INDEX IF NOT EXISTS idx_facilities_year_category_id ON facilities(year, category, id);
+CREATE INDEX IF NOT EXISTS idx_health_platforms_year_id ON health_platforms(year, id);
+
+-- District filters
+CREATE INDEX IF NOT EXISTS idx_facilities_district ON facilities(district);
+CREATE INDEX IF NOT EXISTS idx_health_platforms_district ON health_platforms(district);
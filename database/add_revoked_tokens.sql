@@ -0,0 +1,16 @@
+-- Migration: Revoked JWT ids
+-- Tokens now carry a jti claim; logout records it here and every worker rejects it
+-- (each worker reloads the list at most every AUTH_CACHE_TTL seconds).
+-- Safe to run on existing databases; POST /api/admin/init-tables creates the same table.
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti VARCHAR(64) PRIMARY KEY,
+    user_id INTEGER,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_user_id ON revoked_tokens (user_id);
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at);
+
+COMMENT ON TABLE revoked_tokens IS 'JWT ids revoked by logout; rows past expires_at are purged on the next revoke';
@@ -0,0 +1,25 @@
+-- Migration: Background upload jobs
+-- POST /api/upload and /api/upload-boundaries enqueue the saved file and return a job id;
+-- a worker thread pool imports it and records progress here for GET /api/jobs/<id>.
+-- Safe to run on existing databases; POST /api/admin/init-tables creates the same table.
+
+CREATE TABLE IF NOT EXISTS upload_jobs (
+    id VARCHAR(32) PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,
+    filename VARCHAR(255),
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    phase VARCHAR(40) NOT NULL DEFAULT 'queued',
+    rows_processed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT,
+    created_by INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_upload_jobs_created_by ON upload_jobs (created_by);
+CREATE INDEX IF NOT EXISTS ix_upload_jobs_created_at ON upload_jobs (created_at);
+
+COMMENT ON TABLE upload_jobs IS 'Background upload jobs with progress (phase, rows processed, errors)';
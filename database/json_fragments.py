@@ -0,0 +1,14 @@
+"""
+Pre-serialized JSON values for model serializers
+
+Models return PostGIS geometry text (ST_AsGeoJSON) and stored JSON results
+wrapped with raw_json(), so the orjson-backed provider in geo_formats embeds
+them verbatim instead of parsing and re-encoding them.
+"""
+
+import orjson
+
+
+def raw_json(text):
+    """Embed an already-serialized JSON value (e.g. ST_AsGeoJSON output) verbatim"""
+    return orjson.Fragment(text) if text is not None else None
@@ -3,6 +3,7 @@ from geoalchemy2 import Geometry
 from datetime import datetime
 from sqlalchemy import func, Table, Column, Integer, ForeignKey
 from werkzeug.security import generate_password_hash, check_password_hash
+from database.json_fragments import raw_json
 
 db = SQLAlchemy()
 
@@ -30,19 +31,20 @@ class HealthPlatform(db.Model):
     description = db.Column(db.Text)
     district = db.Column(db.String(100))
     location = db.Column(Geometry('POINT', srid=4326), nullable=False)
+    # Boundary containing the point, assigned by a spatial join on write (see assign_districts)
+    # Deferred so ORM loads never fail before the column is migrated
+    district_id = db.deferred(db.Column(db.Integer, db.ForeignKey('district_boundaries.id', ondelete='SET NULL')))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def to_geojson_feature(self):
-        """Convert to GeoJSON feature"""
-        # Extract coordinates from PostGIS geometry
+        """Convert to GeoJSON feature (serialize with jsonify / geo_formats.dumps_bytes)"""
+        # PostGIS geometry text is embedded as-is rather than parsed and re-encoded
         coords = db.session.scalar(func.ST_AsGeoJSON(self.location))
-        import json
-        geometry = json.loads(coords)
         
         return {
             "type": "Feature",
-            "geometry": geometry,
+            "geometry": raw_json(coords),
             "properties": {
                 "id": self.id,
                 "name": self.name,
@@ -163,6 +165,71 @@ class TrendData(db.Model):
         return f'<TrendData {self.year}>'
 
 
+class DataVersion(db.Model):
+    """Per-table data version counters, bumped on every write (drives ETags and caches)"""
+    __tablename__ = 'data_versions'
+    
+    table_name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @staticmethod
+    def get_versions(table_names):
+        """Current version of each table (0 if never written through the API)"""
+        rows = DataVersion.query.filter(DataVersion.table_name.in_(table_names)).all()
+        versions = {name: 0 for name in table_names}
+        versions.update({row.table_name: row.version for row in rows})
+        return versions
+    
+    @staticmethod
+    def bump(table_name):
+        """Increment a table's version (atomic across workers)"""
+        db.session.execute(db.text("""
+            INSERT INTO data_versions (table_name, version, updated_at)
+            VALUES (:table_name, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT (table_name)
+            DO UPDATE SET version = data_versions.version + 1, updated_at = CURRENT_TIMESTAMP
+        """), {'table_name': table_name})
+        db.session.commit()
+    
+    def __repr__(self):
+        return f'<DataVersion {self.table_name} v{self.version}>'
+
+
+class DistrictBoundaryPiece(db.Model):
+    """ST_Subdivide pieces of a district boundary (bounded vertex count) for point-in-polygon tests"""
+    __tablename__ = 'district_boundary_pieces'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    boundary_id = db.Column(db.Integer, db.ForeignKey('district_boundaries.id', ondelete='CASCADE'),
+                            nullable=False, index=True)
+    geom = db.Column(Geometry('Polygon', srid=4326), nullable=False)
+    
+    def __repr__(self):
+        return f'<DistrictBoundaryPiece {self.id} of boundary {self.boundary_id}>'
+
+
+class DistrictRollup(db.Model):
+    """Point counts per (district, year, source table, category, sub_type), maintained on write.
+
+    Health platform rows use type as category and '' as sub_type and also carry
+    youth/total member sums.
+    """
+    __tablename__ = 'district_rollups'
+    
+    district_id = db.Column(db.Integer, primary_key=True)
+    year = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(30), primary_key=True)  # health_platforms, facilities
+    category = db.Column(db.String(100), primary_key=True)
+    sub_type = db.Column(db.String(100), primary_key=True, default='')
+    item_count = db.Column(db.Integer, nullable=False, default=0)
+    youth_count = db.Column(db.BigInteger, nullable=False, default=0)
+    total_members = db.Column(db.BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<DistrictRollup {self.district_id}/{self.year} {self.source}:{self.category}/{self.sub_type}>'
+
+
 class User(db.Model):
     """User Model for Authentication and Authorization"""
     __tablename__ = 'users'
@@ -202,8 +269,13 @@ class User(db.Model):
     
     def has_role(self, required_role):
         """Check if user has required role or higher"""
+        return User.role_satisfies(self.role, required_role)
+    
+    @staticmethod
+    def role_satisfies(role, required_role):
+        """Check if `role` is `required_role` or higher"""
         role_hierarchy = {'viewer': 1, 'editor': 2, 'admin': 3}
-        user_level = role_hierarchy.get(self.role, 0)
+        user_level = role_hierarchy.get(role, 0)
         required_level = role_hierarchy.get(required_role, 0)
         return user_level >= required_level
     
@@ -211,6 +283,125 @@ class User(db.Model):
         return f'<User {self.username} ({self.role})>'
 
 
+class RevokedToken(db.Model):
+    """Revoked JWT ids (logout); rows past expires_at can be purged"""
+    __tablename__ = 'revoked_tokens'
+    
+    jti = db.Column(db.String(64), primary_key=True)
+    user_id = db.Column(db.Integer, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @staticmethod
+    def revoke(jti, user_id, expires_at):
+        """Record a token as revoked (idempotent) and drop rows that have expired"""
+        db.session.execute(db.text("""
+            INSERT INTO revoked_tokens (jti, user_id, expires_at, revoked_at)
+            VALUES (:jti, :user_id, :expires_at, CURRENT_TIMESTAMP)
+            ON CONFLICT (jti) DO NOTHING
+        """), {'jti': jti, 'user_id': user_id, 'expires_at': expires_at})
+        RevokedToken.query.filter(RevokedToken.expires_at <= datetime.utcnow()).delete()
+        db.session.commit()
+    
+    @staticmethod
+    def active_ids():
+        """Ids of revoked tokens that have not expired yet"""
+        rows = db.session.query(RevokedToken.jti).filter(RevokedToken.expires_at > datetime.utcnow()).all()
+        return frozenset(row[0] for row in rows)
+    
+    def __repr__(self):
+        return f'<RevokedToken {self.jti}>'
+
+
+class UploadJob(db.Model):
+    """Background upload job; progress is written while the import runs"""
+    __tablename__ = 'upload_jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # 'points' or 'boundaries'
+    filename = db.Column(db.String(255))
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    phase = db.Column(db.String(40), nullable=False, default='queued')
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    result = db.Column(db.Text)  # JSON body the synchronous upload would have returned
+    created_by = db.Column(db.Integer, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    started_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    @staticmethod
+    def create(job_id, kind, filename, created_by=None):
+        now = datetime.utcnow()
+        with db.engine.begin() as connection:
+            connection.execute(UploadJob.__table__.insert().values(
+                id=job_id, kind=kind, filename=filename, status='queued', phase='queued',
+                rows_processed=0, created_by=created_by, created_at=now, updated_at=now
+            ))
+    
+    @staticmethod
+    def update(job_id, **fields):
+        """Write job fields on their own connection, so progress is visible to other
+        workers while the import's own transaction is still open"""
+        fields['updated_at'] = datetime.utcnow()
+        with db.engine.begin() as connection:
+            connection.execute(
+                UploadJob.__table__.update().where(UploadJob.__table__.c.id == job_id).values(**fields)
+            )
+    
+    @staticmethod
+    def start(job_id):
+        """Move a queued job to running; False if it is no longer queued (e.g. failed as stale)"""
+        now = datetime.utcnow()
+        table = UploadJob.__table__
+        with db.engine.begin() as connection:
+            result = connection.execute(
+                table.update()
+                .where((table.c.id == job_id) & (table.c.status == 'queued'))
+                .values(status='running', phase='importing', started_at=now, updated_at=now)
+            )
+        return result.rowcount > 0
+    
+    @staticmethod
+    def fail_stale(cutoff, job_id=None):
+        """Mark queued/running jobs not updated since `cutoff` as failed: the worker
+        that held them is gone (restart or redeploy). Returns the number marked."""
+        now = datetime.utcnow()
+        table = UploadJob.__table__
+        condition = table.c.status.in_(('queued', 'running')) & (table.c.updated_at < cutoff)
+        if job_id is not None:
+            condition = condition & (table.c.id == job_id)
+        with db.engine.begin() as connection:
+            result = connection.execute(table.update().where(condition).values(
+                status='failed', phase='failed', finished_at=now, updated_at=now,
+                error='Job was interrupted before it finished (worker restarted); please upload the file again'
+            ))
+        return result.rowcount
+    
+    def to_dict(self):
+        end = self.finished_at or self.updated_at
+        elapsed = (end - self.started_at).total_seconds() if self.started_at and end else None
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'filename': self.filename,
+            'status': self.status,
+            'phase': self.phase,
+            'rows_processed': self.rows_processed,
+            'rows_per_second': round(self.rows_processed / elapsed, 1) if elapsed else None,
+            'elapsed_seconds': round(elapsed, 1) if elapsed is not None else None,
+            'error': self.error,
+            'result': raw_json(self.result),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    def __repr__(self):
+        return f'<UploadJob {self.id} {self.status}>'
+
+
 class DistrictBoundary(db.Model):
     """District Boundary Model with Youth Representative Information"""
     __tablename__ = 'district_boundaries'
@@ -223,6 +414,12 @@ class DistrictBoundary(db.Model):
     boundary = db.Column(Geometry('MultiPolygon', srid=4326), nullable=False)
     center_point = db.Column(Geometry('Point', srid=4326))
     
+    # Simplified boundary tiers for low-zoom map views (see BOUNDARY_SIMPLIFICATION_TIERS)
+    # Deferred so ORM loads never pull them (or fail before the columns are migrated)
+    boundary_simplified_z8 = db.deferred(db.Column(Geometry('MultiPolygon', srid=4326)))
+    boundary_simplified_z11 = db.deferred(db.Column(Geometry('MultiPolygon', srid=4326)))
+    boundary_simplified_z14 = db.deferred(db.Column(Geometry('MultiPolygon', srid=4326)))
+    
     # Youth Representative Information
     youth_rep_name = db.Column(db.String(200))
     youth_rep_title = db.Column(db.String(200))
@@ -234,14 +431,13 @@ class DistrictBoundary(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def to_geojson_feature(self):
-        """Convert to GeoJSON feature"""
-        # Extract coordinates from PostGIS geometry
+        """Convert to GeoJSON feature (serialize with jsonify / geo_formats.dumps_bytes)"""
+        # PostGIS geometry text is embedded as-is rather than parsed and re-encoded
         boundary_coords = db.session.scalar(func.ST_AsGeoJSON(self.boundary))
         center_coords = db.session.scalar(func.ST_AsGeoJSON(self.center_point)) if self.center_point else None
         
-        import json
-        boundary_geom = json.loads(boundary_coords)
-        center_geom = json.loads(center_coords) if center_coords else None
+        boundary_geom = raw_json(boundary_coords)
+        center_geom = raw_json(center_coords)
         
         return {
             "type": "Feature",
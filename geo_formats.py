@@ -0,0 +1,331 @@
+"""
+Alternative encodings for geospatial API responses
+
+Fast JSON: an orjson-backed Flask JSON provider. Geometry text produced by
+PostGIS (ST_AsGeoJSON) is wrapped with raw_json() and embedded verbatim
+instead of being parsed with json.loads only to be re-encoded.
+
+TopoJSON: neighbouring suburbs share most of their edges, so boundaries are
+encoded once as arcs (shared edges stored a single time) on an integer grid.
+
+Arrow IPC / FlatGeobuf: columnar and binary encodings for bulk point pulls,
+built from query result columns (geometry as WKB) rather than per-row dicts.
+"""
+
+import decimal
+import json
+import os
+import shutil
+import tempfile
+from datetime import date
+
+import orjson
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from werkzeug.http import http_date
+
+from database.json_fragments import raw_json
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.stream'
+FLATGEOBUF_MIMETYPE = 'application/flatgeobuf'
+
+DEFAULT_QUANTIZATION = 100000
+
+# Dates go through _default so they serialize exactly like Flask's default provider
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _default(o):
+    """Types orjson does not handle natively, matching Flask's DefaultJSONProvider"""
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj, option=0):
+    return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS | option)
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider using orjson; understands raw_json() fragments.
+
+    Honours sort_keys and compact like DefaultJSONProvider, and the sort_keys,
+    indent and separators arguments of dumps(). Other json.dumps arguments are
+    handed to DefaultJSONProvider, which cannot embed raw_json() fragments.
+    """
+
+    sort_keys = DefaultJSONProvider.sort_keys
+    compact = DefaultJSONProvider.compact
+    mimetype = DefaultJSONProvider.mimetype
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._fallback = DefaultJSONProvider(app)
+
+    def _options(self, sort_keys=None, indent=None):
+        option = 0
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        sort_keys = kwargs.pop('sort_keys', None)
+        indent = kwargs.pop('indent', None)
+        # orjson output is always compact; other separators are not supported
+        if kwargs.get('separators', (',', ':')) != (',', ':') or set(kwargs) - {'separators'}:
+            return self._fallback.dumps(obj, sort_keys=self.sort_keys if sort_keys is None else sort_keys,
+                                        indent=indent, **kwargs)
+        return dumps_bytes(obj, self._options(sort_keys, indent)).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(dumps_bytes(obj, self._options(indent=indent)), mimetype=self.mimetype)
+
+
+def _bounding_box(geometries):
+    """Bounding box (x0, y0, x1, y1) over all polygon coordinates"""
+    x0 = y0 = float('inf')
+    x1 = y1 = float('-inf')
+    for polygons in geometries:
+        for polygon in polygons:
+            for ring in polygon:
+                for x, y in ring:
+                    x0, x1 = min(x0, x), max(x1, x)
+                    y0, y1 = min(y0, y), max(y1, y)
+    return x0, y0, x1, y1
+
+
+def _as_polygons(geometry):
+    """Coordinates of a Polygon/MultiPolygon GeoJSON geometry as a list of polygons"""
+    if not geometry:
+        return []
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    raise ValueError(f"TopoJSON encoding supports Polygon/MultiPolygon, got {geometry['type']}")
+
+
+def _quantize_ring(ring, transform):
+    """Quantize a ring to the integer grid and drop repeated points (closing point removed)"""
+    x0, y0, kx, ky = transform
+    points = []
+    for coord in ring:
+        point = (round((coord[0] - x0) / kx), round((coord[1] - y0) / ky))
+        if not points or points[-1] != point:
+            points.append(point)
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points
+
+
+def _find_junctions(rings):
+    """Points where rings stop sharing a path: same point, different neighbours"""
+    neighbours = {}
+    junctions = set()
+    for ring in rings:
+        n = len(ring)
+        for i, point in enumerate(ring):
+            previous, following = ring[i - 1], ring[(i + 1) % n]
+            key = (previous, following) if previous <= following else (following, previous)
+            seen = neighbours.setdefault(point, key)
+            if seen != key:
+                junctions.add(point)
+    return junctions
+
+
+class _ArcIndex:
+    """Deduplicates arcs, returning TopoJSON arc references (~i for reversed reuse)"""
+
+    def __init__(self):
+        self.arcs = []
+        self.index = {}
+
+    def add(self, points):
+        key = tuple(points)
+        if key in self.index:
+            return self.index[key]
+        reversed_key = key[::-1]
+        if reversed_key in self.index:
+            return ~self.index[reversed_key]
+        self.index[key] = len(self.arcs)
+        self.arcs.append(points)
+        return self.index[key]
+
+    def add_closed(self, ring):
+        """Closed ring with no junctions: match it regardless of start point or direction"""
+        start = ring.index(min(ring))
+        forward = ring[start:] + ring[:start]
+        backward = forward[:1] + forward[1:][::-1]
+        if tuple(forward + forward[:1]) in self.index:
+            return self.index[tuple(forward + forward[:1])]
+        if tuple(backward + backward[:1]) in self.index:
+            return ~self.index[tuple(backward + backward[:1])]
+        return self.add(forward + forward[:1])
+
+    def delta_encoded(self):
+        encoded = []
+        for arc in self.arcs:
+            px, py = arc[0]
+            deltas = [[px, py]]
+            for x, y in arc[1:]:
+                deltas.append([x - px, y - py])
+                px, py = x, y
+            encoded.append(deltas)
+        return encoded
+
+
+def _cut_ring(ring, junctions, arc_index):
+    """Split a ring at its junction points and register the pieces as arcs"""
+    cuts = [i for i, point in enumerate(ring) if point in junctions]
+    if not cuts:
+        return [arc_index.add_closed(ring)]
+
+    rotated = ring[cuts[0]:] + ring[:cuts[0]]
+    rotated.append(rotated[0])
+    arc_refs = []
+    start = 0
+    for i in range(1, len(rotated)):
+        if rotated[i] in junctions or i == len(rotated) - 1:
+            arc_refs.append(arc_index.add(rotated[start:i + 1]))
+            start = i
+    return arc_refs
+
+
+def encode_topojson(features, object_name='boundaries', quantization=DEFAULT_QUANTIZATION):
+    """Encode Polygon/MultiPolygon features as a quantized TopoJSON Topology.
+
+    features: iterable of dicts with 'geometry' (GeoJSON dict), 'properties'
+    and optional 'id'. Shared edges between features are stored once in
+    `arcs` and referenced from each geometry.
+    """
+    features = list(features)
+    geometries = [_as_polygons(feature.get('geometry')) for feature in features]
+
+    x0, y0, x1, y1 = _bounding_box(geometries)
+    if x0 == float('inf'):
+        x0 = y0 = x1 = y1 = 0
+    kx = (x1 - x0) / (quantization - 1) if x1 > x0 else 1
+    ky = (y1 - y0) / (quantization - 1) if y1 > y0 else 1
+    transform = (x0, y0, kx, ky)
+
+    quantized = [
+        [[_quantize_ring(ring, transform) for ring in polygon] for polygon in polygons]
+        for polygons in geometries
+    ]
+    quantized = [
+        [[ring for ring in polygon if len(ring) > 2] for polygon in polygons]
+        for polygons in quantized
+    ]
+    junctions = _find_junctions(ring for polygons in quantized for polygon in polygons for ring in polygon)
+
+    arc_index = _ArcIndex()
+    topo_geometries = []
+    for feature, polygons in zip(features, quantized):
+        polygon_arcs = [
+            [_cut_ring(ring, junctions, arc_index) for ring in polygon]
+            for polygon in polygons if polygon
+        ]
+        if len(polygon_arcs) == 1:
+            geometry = {'type': 'Polygon', 'arcs': polygon_arcs[0]}
+        elif polygon_arcs:
+            geometry = {'type': 'MultiPolygon', 'arcs': polygon_arcs}
+        else:
+            geometry = {'type': None}
+        if feature.get('id') is not None:
+            geometry['id'] = feature['id']
+        geometry['properties'] = feature.get('properties') or {}
+        topo_geometries.append(geometry)
+
+    return {
+        'type': 'Topology',
+        'transform': {'scale': [kx, ky], 'translate': [x0, y0]},
+        'objects': {
+            object_name: {'type': 'GeometryCollection', 'geometries': topo_geometries}
+        },
+        'arcs': arc_index.delta_encoded()
+    }
+
+
+def result_columns(result):
+    """Transpose a query result into (column names, list of column value lists)"""
+    names = list(result.keys())
+    rows = result.fetchall()
+    if not rows:
+        return names, [[] for _ in names]
+    return names, [list(values) for values in zip(*rows)]
+
+
+def _wkb_column(values):
+    # psycopg2 returns bytea as memoryview
+    return [bytes(value) if value is not None else None for value in values]
+
+
+def encode_arrow(names, columns, geometry='geometry'):
+    """Arrow IPC stream of the columns; `geometry` holds WKB points tagged as geoarrow.wkb.
+
+    The schema also carries GeoParquet-style 'geo' metadata so GeoPandas /
+    GDAL readers recognise the geometry column and its CRS.
+    """
+    if pa is None:
+        raise RuntimeError("format=arrow requires pyarrow")
+
+    fields = []
+    arrays = []
+    for name, values in zip(names, columns):
+        if name == geometry:
+            array = pa.array(_wkb_column(values), type=pa.binary())
+            fields.append(pa.field(name, pa.binary(), metadata={
+                b'ARROW:extension:name': b'geoarrow.wkb',
+                b'ARROW:extension:metadata': b'{"crs":"OGC:CRS84"}'
+            }))
+        else:
+            array = pa.array(values)
+            fields.append(pa.field(name, array.type))
+        arrays.append(array)
+
+    geo_metadata = {
+        'version': '1.0.0',
+        'primary_column': geometry,
+        'columns': {geometry: {'encoding': 'WKB', 'geometry_types': ['Point'], 'crs': 'OGC:CRS84'}}
+    }
+    schema = pa.schema(fields, metadata={b'geo': json.dumps(geo_metadata).encode()})
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_flatgeobuf(names, columns, geometry='geometry'):
+    """FlatGeobuf (with packed spatial index) of the columns; `geometry` holds WKB points"""
+    import geopandas as gpd
+
+    properties = {name: values for name, values in zip(names, columns) if name != geometry}
+    geometries = gpd.GeoSeries.from_wkb(_wkb_column(columns[names.index(geometry)]), crs='EPSG:4326')
+    frame = gpd.GeoDataFrame(properties, geometry=geometries)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, 'export.fgb')
+        frame.to_file(path, driver='FlatGeobuf')
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
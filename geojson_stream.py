@@ -0,0 +1,178 @@
+"""
+Incremental readers for large GeoJSON and shapefile uploads
+
+A FeatureCollection is read from disk feature by feature instead of with
+json.load, so memory use is bounded by the largest single feature (plus one
+read chunk) rather than by the size of the file. Importers consume the
+features lazily and write them in batches. A single value larger than
+MAX_FEATURE_SIZE (e.g. a malformed feature that never closes) is rejected
+instead of being read to the end of the file. Shapefiles are read the same
+way, SHAPEFILE_READ_ROWS features at a time.
+"""
+
+import json
+
+READ_CHUNK_SIZE = 1024 * 1024
+MAX_FEATURE_SIZE = 64 * 1024 * 1024
+SHAPEFILE_READ_ROWS = 5000
+WHITESPACE = ' \t\r\n'
+
+
+class GeoJSONFormatError(ValueError):
+    """The file is not a well-formed GeoJSON FeatureCollection"""
+
+
+class GeoJSONFeatureStream:
+    """Iterate over the features of a FeatureCollection file.
+
+    Top-level members other than "features" (type, crs, name, ...) are kept in
+    `members` as they are read. A "type" other than FeatureCollection raises
+    GeoJSONFormatError; when "type" comes after "features" in the file that is
+    only detected once the features have been consumed, so importers should
+    not commit before the iterator is exhausted.
+    """
+
+    def __init__(self, path, chunk_size=READ_CHUNK_SIZE, max_feature_size=MAX_FEATURE_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.max_feature_size = max_feature_size
+        self.members = {}
+        self._decoder = json.JSONDecoder()
+        self._file = None
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        with open(self.path, 'r', encoding='utf-8-sig') as f:
+            self._file = f
+            self._buffer, self._pos, self._eof = '', 0, False
+            try:
+                yield from self._collection()
+            finally:
+                self._file = None
+                self._buffer = ''
+
+    def _collection(self):
+        self._take('{')
+        if self._peek() == '}':
+            self._pos += 1
+        else:
+            while True:
+                key = self._value()
+                if not isinstance(key, str):
+                    raise GeoJSONFormatError("Invalid GeoJSON: expected a member name")
+                self._take(':')
+                if key == 'features':
+                    yield from self._features()
+                else:
+                    self.members[key] = self._value()
+                    if key == 'type' and self.members[key] != 'FeatureCollection':
+                        raise GeoJSONFormatError("Invalid GeoJSON format. Must be a FeatureCollection")
+                if self._take(',}') == '}':
+                    break
+
+        if self.members.get('type') != 'FeatureCollection':
+            raise GeoJSONFormatError("Invalid GeoJSON format. Must be a FeatureCollection")
+
+    def _features(self):
+        self._take('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            feature = self._value()
+            if isinstance(feature, dict):
+                yield feature
+            if self._take(',]') == ']':
+                return
+
+    def _fill(self, size):
+        """Append up to `size` characters to the unread part of the buffer"""
+        chunk = self._file.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """Next non-whitespace character without consuming it (None at end of file)"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(self.chunk_size):
+                return None
+
+    def _take(self, expected):
+        char = self._peek()
+        if char is None or char not in expected:
+            found = 'end of file' if char is None else repr(char)
+            raise GeoJSONFormatError(f"Invalid GeoJSON: expected one of {expected!r}, found {found}")
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Decode the next JSON value, reading more of the file until it is complete"""
+        self._peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise GeoJSONFormatError(f"Invalid GeoJSON: {e}") from e
+            pending = len(self._buffer) - self._pos
+            if pending > self.max_feature_size:
+                raise GeoJSONFormatError(
+                    f"Invalid GeoJSON: a value is malformed or larger than {self.max_feature_size} characters")
+            # Grow reads geometrically so one very large feature is not re-decoded per chunk
+            self._fill(min(size, self.max_feature_size + 1 - pending))
+            size *= 2
+
+
+class ShapefileFeatureStream:
+    """Iterate over the features of a shapefile as GeoJSON dicts, one block of rows at a time.
+    
+    Each block is read with geopandas and converted through to_json(), so
+    features look exactly as they would from a whole-file conversion.
+    """
+
+    def __init__(self, path, rows=SHAPEFILE_READ_ROWS):
+        self.path = path
+        self.rows = rows
+        self.members = {'type': 'FeatureCollection'}
+
+    def __iter__(self):
+        import geopandas as gpd
+
+        start = 0
+        while True:
+            gdf = gpd.read_file(self.path, rows=slice(start, start + self.rows))
+            if gdf.empty:
+                return
+            yield from json.loads(gdf.to_json())['features']
+            if len(gdf) < self.rows:
+                return
+            start += self.rows
+
+
+def geojson_features(geojson_data):
+    """Features of a parsed FeatureCollection dict or of a feature stream"""
+    if isinstance(geojson_data, dict):
+        return geojson_data.get('features', [])
+    return geojson_data
+
+
+def geojson_member(geojson_data, name, default=None):
+    """Top-level member of a parsed FeatureCollection dict or of a feature stream"""
+    if isinstance(geojson_data, dict):
+        return geojson_data.get(name, default)
+    return geojson_data.members.get(name, default)
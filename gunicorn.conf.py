@@ -0,0 +1,13 @@
+"""
+Gunicorn settings picked up automatically from the working directory
+(gunicorn app_db:app ...). Command-line flags still take precedence.
+"""
+
+
+def on_starting(server):
+    """Once per deployment, in the master before any worker starts"""
+    from app_db import app, db, fail_interrupted_upload_jobs
+    fail_interrupted_upload_jobs()
+    # Workers are forked from the master: do not let them inherit its pooled connections
+    with app.app_context():
+        db.engine.dispose()
@@ -702,6 +702,8 @@ const AdminDashboard = () => {
       if (newPlatform.district) {
         formData.append('district', newPlatform.district);
       }
+      // Single feature: import within the request so the refreshed list includes it
+      formData.append('sync', 'true');
 
       await axios.post(getApiUrl('api/upload'), formData);
       
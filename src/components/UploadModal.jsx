@@ -1,9 +1,14 @@
-import React, { useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import axios from 'axios';
 import { getApiUrl } from '../config';
 import { X, Upload, FileJson, AlertCircle, CheckCircle } from 'lucide-react';
 import './UploadModal.css';
 
+const JOB_POLL_INTERVAL_MS = 1000;
+// Give up when a job reports no progress for this long, or runs longer than the overall limit
+const JOB_STALL_TIMEOUT_MS = 5 * 60 * 1000;
+const JOB_MAX_WAIT_MS = 60 * 60 * 1000;
+
 const UploadModal = ({ onClose, onUploadSuccess, defaultCategory = 'health' }) => {
   const [selectedFile, setSelectedFile] = useState(null);
   const [uploading, setUploading] = useState(false);
@@ -80,6 +85,49 @@ const UploadModal = ({ onClose, onUploadSuccess, defaultCategory = 'health' }) =
     }
   };
 
+  // Polling stops when the modal is closed
+  const unmounted = useRef(false);
+  useEffect(() => () => {
+    unmounted.current = true;
+  }, []);
+
+  const waitForJob = async (jobId, headers) => {
+    const jobUrl = getApiUrl(`api/jobs/${jobId}`);
+    const startedAt = Date.now();
+    let lastProgress = null;
+    let lastProgressAt = startedAt;
+
+    while (!unmounted.current) {
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+      if (unmounted.current) {
+        break;
+      }
+      const { data: job } = await axios.get(jobUrl, { headers: { Authorization: headers.Authorization } });
+      if (job.status === 'done') {
+        return job.result;
+      }
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Upload failed');
+      }
+
+      const now = Date.now();
+      const progress = `${job.status}:${job.phase}:${job.rows_processed}`;
+      if (progress !== lastProgress) {
+        lastProgress = progress;
+        lastProgressAt = now;
+      } else if (now - lastProgressAt > JOB_STALL_TIMEOUT_MS) {
+        throw new Error(`Upload job ${jobId} has stopped making progress. Check again later or re-upload the file.`);
+      }
+      if (now - startedAt > JOB_MAX_WAIT_MS) {
+        throw new Error(`Upload job ${jobId} is taking too long. Check again later or re-upload the file.`);
+      }
+
+      const rate = job.rows_per_second ? ` (${Math.round(job.rows_per_second)} rows/s)` : '';
+      setMessage(`Processing: ${job.phase}, ${job.rows_processed} rows${rate}`);
+    }
+    return null;
+  };
+
   const handleUpload = async () => {
     if (!selectedFile) {
       setUploadStatus('error');
@@ -121,21 +169,35 @@ const UploadModal = ({ onClose, onUploadSuccess, defaultCategory = 'health' }) =
       
       const response = await axios.post(endpoint, formData, { headers });
 
+      // Uploads are imported by a background job (202 + job_id); poll until it finishes
+      let result = response.data;
+      if (response.status === 202 && response.data.job_id) {
+        result = await waitForJob(response.data.job_id, headers);
+        if (unmounted.current) {
+          return;
+        }
+      }
+
       setUploadStatus('success');
       if (isBoundary) {
-        setMessage(`Successfully uploaded ${response.data.features} boundaries from ${response.data.filename}`);
+        setMessage(`Successfully uploaded ${result.features} boundaries from ${result.filename}`);
       } else {
-        setMessage(`Successfully uploaded ${response.data.features} ${uploadMetadata.category} features from ${response.data.filename} for year ${uploadMetadata.year}`);
+        setMessage(`Successfully uploaded ${result.features} ${uploadMetadata.category} features from ${result.filename} for year ${uploadMetadata.year}`);
       }
       
       setTimeout(() => {
         onUploadSuccess();
       }, 2000);
     } catch (error) {
+      if (unmounted.current) {
+        return;
+      }
       setUploadStatus('error');
-      setMessage(error.response?.data?.error || 'Error uploading file. Please try again.');
+      setMessage(error.response?.data?.error || error.message || 'Error uploading file. Please try again.');
     } finally {
-      setUploading(false);
+      if (!unmounted.current) {
+        setUploading(false);
+      }
     }
   };
 
@@ -0,0 +1,47 @@
+"""
+Shared fixtures for the backend tests
+
+Run from the repository root with: python -m pytest tests (pip install pytest)
+The app is imported against a throwaway SQLite database; only the tables a
+test needs are created, so no PostGIS server is required.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_scratch = tempfile.mkdtemp(prefix='srhr-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_scratch, 'test.db')}"
+os.environ.setdefault('UPLOAD_FOLDER', os.path.join(_scratch, 'uploads'))
+os.environ.setdefault('TILE_CACHE_FOLDER', os.path.join(_scratch, 'tile_cache'))
+os.environ.setdefault('TILE_ARCHIVE_FOLDER', os.path.join(_scratch, 'tile_archives'))
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    import app_db
+    return app_db
+
+
+@pytest.fixture
+def app(app_module):
+    return app_module.app
+
+
+@pytest.fixture
+def data_versions(app_module):
+    """A fresh data_versions table, dropped again after the test"""
+    from database.models import db, DataVersion
+
+    with app_module.app.app_context():
+        DataVersion.__table__.create(db.engine, checkfirst=True)
+        app_module.response_cache.entries.clear()
+        app_module.response_cache.size = 0
+        yield DataVersion
+        db.session.remove()
+        DataVersion.__table__.drop(db.engine)
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from geojson_stream import GeoJSONFeatureStream, GeoJSONFormatError, geojson_features, geojson_member
+
+
+def write(tmp_path, text, name='upload.geojson'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def feature(n, **properties):
+    return {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [31.0 + n, -17.8]},
+            'properties': dict({'name': f'Point {n}'}, **properties)}
+
+
+def test_reads_features_across_chunk_boundaries(tmp_path):
+    features = [feature(n, note='x' * 50) for n in range(20)]
+    path = write(tmp_path, json.dumps({'type': 'FeatureCollection', 'features': features}))
+
+    stream = GeoJSONFeatureStream(path, chunk_size=7)
+
+    assert list(stream) == features
+    assert geojson_member(stream, 'type') == 'FeatureCollection'
+
+
+def test_members_after_features_and_byte_order_mark(tmp_path):
+    text = '\ufeff{"features": [%s], "name": "clinics", "type": "FeatureCollection"}' % json.dumps(feature(1))
+    stream = GeoJSONFeatureStream(write(tmp_path, text), chunk_size=5)
+
+    assert list(geojson_features(stream)) == [feature(1)]
+    assert stream.members == {'name': 'clinics', 'type': 'FeatureCollection'}
+
+
+def test_number_split_at_chunk_end_is_not_truncated(tmp_path):
+    text = '{"type": "FeatureCollection", "count": 1234567, "features": []}'
+    stream = GeoJSONFeatureStream(write(tmp_path, text), chunk_size=len('{"type": "FeatureCollection", "count": 12'))
+
+    assert list(stream) == []
+    assert stream.members['count'] == 1234567
+
+
+def test_empty_feature_collection(tmp_path):
+    stream = GeoJSONFeatureStream(write(tmp_path, '{"type": "FeatureCollection", "features": []}'))
+    assert list(stream) == []
+
+
+@pytest.mark.parametrize('text', [
+    '{"type": "Feature", "geometry": null, "properties": {}}',
+    '{"features": [], "type": "GeometryCollection"}',
+    '{"features": []}',
+    '[]',
+])
+def test_rejects_non_feature_collections(tmp_path, text):
+    with pytest.raises(GeoJSONFormatError):
+        list(GeoJSONFeatureStream(write(tmp_path, text)))
+
+
+@pytest.mark.parametrize('text', [
+    '{"type": "FeatureCollection", "features": [{"type": "Feature"',
+    '{"type": "FeatureCollection", "features": [{"type": "Feature"} {"type": "Feature"}]}',
+    '',
+])
+def test_rejects_truncated_or_malformed_files(tmp_path, text):
+    with pytest.raises(GeoJSONFormatError):
+        list(GeoJSONFeatureStream(write(tmp_path, text), chunk_size=8))
+
+
+def test_oversized_feature_is_rejected_without_reading_the_whole_file(tmp_path):
+    unterminated = '{"type": "FeatureCollection", "features": [%s, {"type": "Feature", "x": [%s' % (
+        json.dumps(feature(1)), '1,' * 100000)
+    stream = GeoJSONFeatureStream(write(tmp_path, unterminated + ' ' * 500000), chunk_size=1000,
+                                  max_feature_size=50000)
+    features = iter(stream)
+
+    assert next(features) == feature(1)
+    with pytest.raises(GeoJSONFormatError, match='larger than 50000'):
+        next(features)
+
+
+def test_feature_up_to_the_limit_is_accepted(tmp_path):
+    big = feature(1, note='x' * 40000)
+    path = write(tmp_path, json.dumps({'type': 'FeatureCollection', 'features': [big]}))
+
+    assert list(GeoJSONFeatureStream(path, chunk_size=10, max_feature_size=50000)) == [big]
+
+
+def test_parsed_dicts_are_accepted_by_the_helpers():
+    collection = {'type': 'FeatureCollection', 'features': [feature(1)], 'crs': {'type': 'name'}}
+
+    assert geojson_features(collection) == [feature(1)]
+    assert geojson_member(collection, 'crs') == {'type': 'name'}
+    assert geojson_member(collection, 'missing', 'default') == 'default'
@@ -0,0 +1,121 @@
+import gzip
+
+import pytest
+
+import app_db
+from database.models import db
+
+calls = {'versioned': 0}
+
+
+# Routes are registered at collection time, before the app handles any request
+@app_db.app.route('/_test/versioned')
+@app_db.conditional_get('test_points')
+@app_db.compressed_cache
+def versioned_listing():
+    calls['versioned'] += 1
+    response = app_db.jsonify({'rows': [{'id': n, 'name': f'Clinic {n}'} for n in range(200)]})
+    response.headers['X-Next-After-Id'] = '199'
+    return response
+
+
+@app_db.app.route('/_test/uncacheable')
+@app_db.conditional_get('test_points')
+@app_db.compressed_cache
+def uncacheable_listing():
+    return app_db.no_store(app_db.jsonify([]))
+
+
+@pytest.fixture
+def client(app, data_versions):
+    calls['versioned'] = 0
+    return app.test_client()
+
+
+def bump(app):
+    with app.app_context():
+        app_db.DataVersion.bump('test_points')
+
+
+def test_etag_and_304(client):
+    first = client.get('/_test/versioned', headers={'Accept-Encoding': 'identity'})
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == app_db.HTTP_CACHE_CONTROL
+    etag = first.headers['ETag']
+    assert not etag.startswith('W/')
+
+    repeat = client.get('/_test/versioned', headers={'If-None-Match': etag, 'Accept-Encoding': 'identity'})
+    assert repeat.status_code == 304
+    assert repeat.headers['ETag'] == etag
+    assert repeat.get_data() == b''
+    assert calls['versioned'] == 1
+
+
+def test_etag_depends_on_query_string(client):
+    plain = client.get('/_test/versioned').headers['ETag']
+    filtered = client.get('/_test/versioned?type=Clinic').headers['ETag']
+    assert plain != filtered
+
+
+def test_write_changes_the_etag(client, app):
+    etag = client.get('/_test/versioned').headers['ETag']
+    bump(app)
+
+    after = client.get('/_test/versioned', headers={'If-None-Match': etag})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != etag
+    assert calls['versioned'] == 2
+
+
+def test_compressed_bodies_are_cached_per_encoding(client):
+    gzipped = client.get('/_test/versioned', headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in gzipped.headers['Vary']
+    assert gzipped.headers['ETag'].startswith('W/')
+    assert gzipped.headers['X-Next-After-Id'] == '199'
+    body = gzip.decompress(gzipped.get_data())
+
+    identity = client.get('/_test/versioned', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in identity.headers
+    assert 'Accept-Encoding' in identity.headers['Vary']
+    assert identity.get_data() == body
+    assert calls['versioned'] == 1
+
+
+def test_weak_etag_revalidates(client):
+    weak = client.get('/_test/versioned', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+
+    repeat = client.get('/_test/versioned', headers={'If-None-Match': weak, 'Accept-Encoding': 'gzip'})
+    assert repeat.status_code == 304
+    assert repeat.headers['ETag'] == weak
+
+
+def test_expired_entries_are_recomputed(client, monkeypatch):
+    client.get('/_test/versioned')
+    monkeypatch.setattr(app_db.response_cache, 'ttl', -1)
+    app_db.response_cache.entries.clear()
+    app_db.response_cache.size = 0
+
+    client.get('/_test/versioned')
+    client.get('/_test/versioned')
+    assert calls['versioned'] == 3
+
+
+def test_no_store_responses_are_neither_etagged_nor_cached(client):
+    response = client.get('/_test/uncacheable')
+
+    assert response.headers['Cache-Control'] == 'no-store'
+    assert 'ETag' not in response.headers
+    assert not app_db.response_cache.entries
+
+
+def test_missing_version_table_serves_uncached(client, app):
+    with app.app_context():
+        app_db.DataVersion.__table__.drop(db.engine)
+    try:
+        response = client.get('/_test/versioned')
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
+    finally:
+        with app.app_context():
+            app_db.DataVersion.__table__.create(db.engine)
@@ -0,0 +1,96 @@
+from collections import namedtuple
+
+import orjson
+import pytest
+
+from geo_formats import dumps_bytes
+
+PLATFORM_FILTERS = {'type': 'type', 'district': 'district'}
+
+
+def test_multi_value_and_bbox_filters(app, app_module):
+    with app.test_request_context('/?type=Clinic,Youth%20Club&type=School&district=Mbare'
+                                  '&bbox=30.9,-17.95,31.2,-17.7&after_id=40'):
+        conditions, params = app_module.listing_filters('hp', PLATFORM_FILTERS)
+
+    assert params['type_values'] == ['Clinic', 'Youth Club', 'School']
+    assert params['district_values'] == ['Mbare']
+    assert (params['bbox_minx'], params['bbox_miny'], params['bbox_maxx'], params['bbox_maxy']) == (
+        30.9, -17.95, 31.2, -17.7)
+    assert params['after_id'] == 40
+    assert "hp.type = ANY(:type_values)" in conditions
+    assert "hp.id > :after_id" in conditions
+
+
+@pytest.mark.parametrize('bbox', ['30.9,-17.95,31.2', '30.9,-17.95,31.2,north', 'everywhere'])
+def test_bad_bbox_raises_value_error(app, app_module, bbox):
+    with app.test_request_context(f'/?bbox={bbox}'):
+        with pytest.raises(ValueError, match='bbox'):
+            app_module.listing_filters('hp', PLATFORM_FILTERS)
+
+
+def test_unlisted_parameters_are_not_filters(app, app_module):
+    with app.test_request_context('/?sub_type=Clinic&after_id=abc'):
+        conditions, params = app_module.listing_filters('hp', PLATFORM_FILTERS)
+
+    assert conditions == [] and params == {}
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('', None),
+    ('?limit=abc', None),
+    ('?limit=0', None),
+    ('?limit=-5', None),
+    ('?limit=250', 250),
+])
+def test_page_limit(app, app_module, query, expected):
+    with app.test_request_context(f'/{query}'):
+        assert app_module.page_limit() == expected
+
+
+def test_page_limit_is_capped(app, app_module):
+    with app.test_request_context(f'/?limit={app_module.MAX_PAGE_SIZE + 1}'):
+        assert app_module.page_limit() == app_module.MAX_PAGE_SIZE
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('', None),
+    ('?cluster=x', None),
+    ('?cluster=-3', 0),
+    ('?cluster=11', 11),
+])
+def test_cluster_zoom(app, app_module, query, expected):
+    with app.test_request_context(f'/{query}'):
+        assert app_module.cluster_zoom() == expected
+
+
+def test_cluster_zoom_expands_at_street_level(app, app_module):
+    with app.test_request_context(f'/?cluster={app_module.CLUSTER_EXPAND_ZOOM}'):
+        assert app_module.cluster_zoom() is None
+
+
+ClusterRow = namedtuple('ClusterRow', ['gx', 'gy', 'longitude', 'latitude', 'point_count', 'categories',
+                                       'id', 'geometry', 'properties'])
+
+
+def test_cluster_cell_feature(app_module):
+    row = ClusterRow(120.0, -85.0, 31.05, -17.83, 12, '{"Clinic" : 9, "School" : 3}', None, None, None)
+
+    assert orjson.loads(dumps_bytes(app_module.cluster_feature(row))) == {
+        'type': 'Feature',
+        'id': '120:-85',
+        'geometry': {'type': 'Point', 'coordinates': [31.05, -17.83]},
+        'properties': {'cluster': True, 'point_count': 12, 'categories': {'Clinic': 9, 'School': 3}}
+    }
+
+
+def test_single_point_cell_is_the_point_itself(app_module):
+    row = ClusterRow(120.0, -85.0, 31.0500001, -17.8299999, 1, '{"Clinic" : 1}', 42,
+                     '{"type":"Point","coordinates":[31.05,-17.83]}', '{"id": 42, "name": "Mbare Clinic"}')
+
+    assert orjson.loads(dumps_bytes(app_module.cluster_feature(row))) == {
+        'type': 'Feature',
+        'id': 42,
+        'geometry': {'type': 'Point', 'coordinates': [31.05, -17.83]},
+        'properties': {'id': 42, 'name': 'Mbare Clinic'}
+    }
@@ -0,0 +1,95 @@
+import pytest
+
+from geo_formats import encode_topojson
+
+
+def decode_arc(arc, transform):
+    """Absolute coordinates of a delta-encoded, quantized arc"""
+    (kx, ky), (x0, y0) = transform['scale'], transform['translate']
+    x = y = 0
+    points = []
+    for dx, dy in arc:
+        x, y = x + dx, y + dy
+        points.append((x * kx + x0, y * ky + y0))
+    return points
+
+
+def decode_ring(ring_arcs, topology):
+    """Stitch a ring back together from its arc references (~index means reversed)"""
+    points = []
+    for index in ring_arcs:
+        arc = decode_arc(topology['arcs'][index if index >= 0 else ~index], topology['transform'])
+        if index < 0:
+            arc.reverse()
+        points.extend(arc if not points else arc[1:])
+    return points
+
+
+def same_ring(decoded, original, tolerance):
+    """Rings match up to start point (both closed) within the quantization step"""
+    original = original[:-1]
+    decoded = decoded[:-1]
+    if len(decoded) != len(original):
+        return False
+    for shift in range(len(original)):
+        rotated = original[shift:] + original[:shift]
+        if all(abs(a[0] - b[0]) <= tolerance and abs(a[1] - b[1]) <= tolerance
+               for a, b in zip(decoded, rotated)):
+            return True
+    return False
+
+
+def square(x, y, size=0.01):
+    return [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+
+
+NEIGHBOURS = [
+    {'id': 1, 'properties': {'name': 'Mbare'},
+     'geometry': {'type': 'Polygon', 'coordinates': [square(31.0, -17.9)]}},
+    {'id': 2, 'properties': {'name': 'Highfield'},
+     'geometry': {'type': 'Polygon', 'coordinates': [square(31.01, -17.9)]}},
+    {'id': 3, 'properties': {'name': 'Glen View'},
+     'geometry': {'type': 'MultiPolygon', 'coordinates': [[square(31.1, -17.9)], [square(31.2, -17.9)]]}},
+]
+
+
+def test_round_trip_restores_every_ring():
+    topology = encode_topojson(NEIGHBOURS, quantization=10000)
+    geometries = topology['objects']['boundaries']['geometries']
+    tolerance = max(topology['transform']['scale'])
+
+    assert topology['type'] == 'Topology'
+    assert [g['id'] for g in geometries] == [1, 2, 3]
+    assert [g['properties']['name'] for g in geometries] == ['Mbare', 'Highfield', 'Glen View']
+
+    for feature, geometry in zip(NEIGHBOURS, geometries):
+        assert geometry['type'] == feature['geometry']['type']
+        if geometry['type'] == 'Polygon':
+            polygons, originals = [geometry['arcs']], [feature['geometry']['coordinates']]
+        else:
+            polygons, originals = geometry['arcs'], feature['geometry']['coordinates']
+        for polygon, original in zip(polygons, originals):
+            for ring_arcs, ring in zip(polygon, original):
+                assert same_ring(decode_ring(ring_arcs, topology), ring, tolerance)
+
+
+def test_shared_edge_is_stored_once():
+    topology = encode_topojson(NEIGHBOURS[:2], quantization=10000)
+    mbare, highfield = topology['objects']['boundaries']['geometries']
+
+    mbare_arcs = {index if index >= 0 else ~index for index in mbare['arcs'][0]}
+    highfield_arcs = {index if index >= 0 else ~index for index in highfield['arcs'][0]}
+    assert mbare_arcs & highfield_arcs
+
+
+def test_rejects_point_geometries():
+    with pytest.raises(ValueError):
+        encode_topojson([{'geometry': {'type': 'Point', 'coordinates': [31.0, -17.8]}}])
+
+
+def test_missing_geometry_becomes_null_geometry():
+    topology = encode_topojson([{'id': 7, 'geometry': None, 'properties': {'name': 'Empty'}}])
+
+    assert topology['objects']['boundaries']['geometries'] == [
+        {'type': None, 'id': 7, 'properties': {'name': 'Empty'}}
+    ]